@@ -0,0 +1,74 @@
+from typing import Any, Dict, Optional, Union
+
+# Mapping "dpi" value meaning "the selected printer's own resolution"
+DEVICE_DPI = "device"
+
+
+def parse_dpi(value: Any) -> Optional[Union[float, str]]:
+    """Normalize a mapping's ``dpi``: a positive number, "device", or None for fit-to-printer"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        if value.strip().lower() == DEVICE_DPI:
+            return DEVICE_DPI
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        return None
+    return float(value)
+
+
+def format_dpi(dpi: Optional[Union[float, str]]) -> str:
+    """Display form of a mapping's ``dpi``"""
+    if dpi is None:
+        return "Auto"
+    return dpi if isinstance(dpi, str) else f"{dpi:g}"
+
+
+class ButtonMapping:
+    """A button's label mapping, normalized from either config format.
+
+    Older configs map a button straight to a file path string; newer ones use
+    ``{"file": ..., "orientation": ..., "dpi": ...}``. Both are resolved once,
+    at load time. ``dpi`` is optional: without it SVG labels are rendered to
+    fill the printer's printable area.
+    """
+
+    __slots__ = ("button_id", "file", "orientation", "dpi")
+
+    def __init__(self, button_id: str, file: str, orientation: str = "portrait",
+                 dpi: Optional[Union[float, str]] = None):
+        self.button_id = button_id
+        self.file = file
+        self.orientation = orientation
+        self.dpi = dpi
+
+    @classmethod
+    def from_config(cls, button_id: str, mapping_data: Any) -> "ButtonMapping":
+        """Build a mapping from a raw ``button_mappings`` value"""
+        if isinstance(mapping_data, dict):
+            return cls(
+                button_id,
+                mapping_data.get("file", ""),
+                (mapping_data.get("orientation") or "portrait").lower(),
+                parse_dpi(mapping_data.get("dpi"))
+            )
+        # Backward compatibility with old format
+        return cls(button_id, str(mapping_data), "portrait")
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"file": self.file, "orientation": self.orientation}
+        if self.dpi is not None:
+            data["dpi"] = self.dpi
+        return data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ButtonMapping):
+            return NotImplemented
+        return (self.button_id, self.file, self.orientation, self.dpi) == \
+            (other.button_id, other.file, other.orientation, other.dpi)
+
+    def __repr__(self) -> str:
+        return f"ButtonMapping({self.button_id!r}, {self.file!r}, {self.orientation!r}, {self.dpi!r})"
@@ -1,11 +1,44 @@
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+import atexit
+import threading
+from typing import Callable, Dict, Any, List, Mapping, Optional, Set, Tuple, Union
+
+from config.button_mapping import ButtonMapping, parse_dpi
+from config.config_snapshot import ConfigSnapshot
+from config.config_writer import DebouncedConfigWriter
 
 class ConfigManager:
-    def __init__(self, config_file: str = "config.json"):
+    """Application settings shared by the GUI and the API server threads.
+    
+    Reads go to an immutable ConfigSnapshot that is replaced whole on every
+    change, so they never lock and never see a half-applied edit. Changes are
+    serialized by a writer lock: each one copies the current data, modifies
+    the copy and publishes it as the next snapshot.
+    """
+    
+    def __init__(self, config_file: str = "config.json", save_debounce: float = 0.5):
         self.config_file = config_file
-        self.config = self._load_config()
+        self.backup_file = config_file + ".bak"
+        self._write_lock = threading.RLock()
+        
+        # Button mappings are normalized once per change; unchanged entries are reused
+        raw = self._load_config()
+        mappings, _ = self._build_mapping_index(raw.get("button_mappings", {}))
+        self._snapshot = ConfigSnapshot(raw, mappings)
+        
+        self._file_stat = self._stat_config_file()
+        self._reload_listeners: List[Callable[[Set[str]], None]] = []
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        
+        # Saves are coalesced and written atomically off the calling thread
+        self._writer = DebouncedConfigWriter(
+            config_file, lambda: self._snapshot.to_dict(), save_debounce,
+            backup_path=self.backup_file, on_written=self._on_config_written
+        )
+        atexit.register(self.flush)
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file or create default config"""
@@ -13,93 +46,246 @@ class ConfigManager:
             "selected_printer": "",
             "button_mappings": {},
             "server_port": 9000,
-            "server_host": "0.0.0.0"
+            "server_host": "0.0.0.0",
+            "server_backend": "auto",
+            "server_threads": 8,
+            "server_keep_alive": 5,
+            "shutdown_drain_timeout": 30,
+            "warm_up_on_start": True,
+            "printer_backends": [],
+            "printer_routes": {},
+            "printer_languages": {},
+            "printer_monochrome": {},
+            "svg_renderer": "auto",
+            "svg_debug_dir": ""
         }
         
-        if os.path.exists(self.config_file):
+        # Fall back to the last known good copy if the main file is corrupt
+        for path in (self.config_file, self.backup_file):
+            if not os.path.exists(path):
+                continue
             try:
-                with open(self.config_file, 'r') as f:
+                with open(path, 'r') as f:
                     config = json.load(f)
                     # Merge with defaults to ensure all keys exist
                     for key, value in default_config.items():
                         if key not in config:
                             config[key] = value
+                    if path != self.config_file:
+                        print(f"Loaded configuration from backup {path}")
                     return config
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config: {e}. Using defaults.")
-                return default_config
-        else:
-            return default_config
+                print(f"Error loading config from {path}: {e}")
+        
+        if os.path.exists(self.config_file):
+            print("Using default configuration.")
+        return default_config
     
-    def save_config(self) -> bool:
-        """Save current configuration to file"""
+    @property
+    def config(self):
+        """Read-only view of the current configuration data"""
+        return self._snapshot.data
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """The current configuration; use one snapshot to read several values consistently"""
+        return self._snapshot
+    
+    def _update(self, mutate: Callable[[Dict[str, Any]], None]) -> Set[str]:
+        """Apply ``mutate`` to a copy of the config and publish it as the new snapshot.
+        
+        Returns the IDs of button mappings that changed.
+        """
+        with self._write_lock:
+            current = self._snapshot
+            raw = current.to_dict()
+            mutate(raw)
+            return self._publish(raw, current)
+    
+    def _publish(self, raw: Dict[str, Any], current: ConfigSnapshot) -> Set[str]:
+        """Swap in a snapshot of ``raw``; caller must hold the write lock"""
+        mappings, changed = self._build_mapping_index(raw.get("button_mappings", {}), current.mappings)
+        self._snapshot = ConfigSnapshot(raw, mappings, current.version + 1)
+        return changed
+    
+    def save_config(self, immediate: bool = False) -> bool:
+        """Save current configuration to file.
+        
+        By default the write is debounced: bursts of changes are coalesced and
+        written atomically on a background thread. Pass ``immediate=True`` to
+        write synchronously.
+        """
+        if immediate:
+            self._writer.flush()
+            return self._writer.write_now()
+        self._writer.schedule()
+        return True
+    
+    def flush(self) -> bool:
+        """Write any pending configuration change now"""
+        return self._writer.flush()
+    
+    def _on_config_written(self) -> None:
+        # Our own write is not an external change
+        self._file_stat = self._stat_config_file()
+    
+    def _stat_config_file(self) -> Optional[Tuple[int, int]]:
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
-            return True
-        except IOError as e:
-            print(f"Error saving config: {e}")
-            return False
+            st = os.stat(self.config_file)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    
+    def _build_mapping_index(self, raw_mappings: Dict[str, Any],
+                             previous: Optional[Mapping[str, ButtonMapping]] = None
+                             ) -> Tuple[Dict[str, ButtonMapping], Set[str]]:
+        """Normalize raw mappings, reusing unchanged entries from ``previous``.
+        
+        Returns the new index and the IDs of buttons that were added, changed or removed.
+        """
+        previous = previous or {}
+        index = {}
+        changed = set()
+        for button_id, mapping_data in raw_mappings.items():
+            entry = ButtonMapping.from_config(button_id, mapping_data)
+            old_entry = previous.get(button_id)
+            if old_entry is not None and old_entry == entry:
+                entry = old_entry
+            else:
+                changed.add(button_id)
+            index[button_id] = entry
+        changed.update(set(previous) - set(index))
+        return index, changed
+    
+    def reload(self) -> Optional[Set[str]]:
+        """Re-read the config file and apply it, returning the changed button IDs.
+        
+        Mappings that did not change keep their existing entries. If the file
+        cannot be parsed the current configuration is kept and None is returned.
+        """
+        try:
+            with open(self.config_file, 'r') as f:
+                config = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error reloading config: {e}. Keeping current settings.")
+            return None
+        
+        with self._write_lock:
+            current = self._snapshot
+            for key, value in current.to_dict().items():
+                config.setdefault(key, value)
+            changed = self._publish(config, current)
+        
+        for listener in list(self._reload_listeners):
+            try:
+                listener(changed)
+            except Exception as e:
+                print(f"Config reload listener failed: {e}")
+        return changed
+    
+    def add_reload_listener(self, listener: Callable[[Set[str]], None]) -> None:
+        """Call ``listener(changed_button_ids)`` after the file is reloaded"""
+        self._reload_listeners.append(listener)
+    
+    def start_watching(self, interval: float = 1.0) -> None:
+        """Reload the config whenever the file is changed by something else"""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+        
+        def watch():
+            while not self._watch_stop.wait(interval):
+                file_stat = self._stat_config_file()
+                if file_stat is not None and file_stat != self._file_stat:
+                    self._file_stat = file_stat
+                    changed = self.reload()
+                    if changed is not None:
+                        print(f"Config file changed; reloaded ({len(changed)} mapping(s) changed)")
+        
+        self._watch_thread = threading.Thread(target=watch, name="config-watch", daemon=True)
+        self._watch_thread.start()
+    
+    def stop_watching(self) -> None:
+        self._watch_stop.set()
     
     def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value"""
-        return self.config.get(key, default)
+        """Get configuration value (read-only for dicts and lists)"""
+        return self._snapshot.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value"""
-        self.config[key] = value
+        self._update(lambda config: config.__setitem__(key, value))
     
     def get_selected_printer(self) -> str:
         """Get currently selected printer name"""
-        return self.config.get("selected_printer", "")
+        return self._snapshot.get("selected_printer", "")
     
     def set_selected_printer(self, printer_name: str) -> None:
         """Set selected printer"""
-        self.config["selected_printer"] = printer_name
+        self.set("selected_printer", printer_name)
+    
+    def get_button_mappings(self) -> Mapping[str, Mapping[str, str]]:
+        """Get button ID to label file mappings with orientation (read-only)"""
+        return self._snapshot.get("button_mappings", {})
     
-    def get_button_mappings(self) -> Dict[str, Dict[str, str]]:
-        """Get button ID to label file mappings with orientation"""
-        return self.config.get("button_mappings", {})
+    def get_mapping_entries(self) -> Mapping[str, ButtonMapping]:
+        """Get normalized button mappings keyed by button ID (read-only)"""
+        return self._snapshot.mappings
+    
+    def get_mapping_entry(self, button_id: str) -> Optional[ButtonMapping]:
+        """Get the normalized mapping for a button, or None if it is not configured"""
+        return self._snapshot.mappings.get(button_id)
     
     def set_button_mappings(self, mappings: Dict[str, Dict[str, str]]) -> None:
         """Set button ID to label file mappings with orientation"""
-        self.config["button_mappings"] = mappings
-    
-    def add_button_mapping(self, button_id: str, label_file: str, orientation: str = "portrait") -> None:
-        """Add a single button mapping with orientation"""
-        if "button_mappings" not in self.config:
-            self.config["button_mappings"] = {}
-        self.config["button_mappings"][button_id] = {
-            "file": label_file,
-            "orientation": orientation
-        }
+        self.set("button_mappings", copy.deepcopy(mappings))
+    
+    def add_button_mapping(self, button_id: str, label_file: str, orientation: str = "portrait",
+                           dpi: Optional[Union[float, str]] = None) -> None:
+        """Add a single button mapping with orientation and optional render DPI"""
+        mapping = ButtonMapping(button_id, label_file, orientation, parse_dpi(dpi))
+        def mutate(config):
+            config.setdefault("button_mappings", {})[button_id] = mapping.to_dict()
+        self._update(mutate)
+    
+    def replace_button_mapping(self, old_button_id: str, button_id: str, label_file: str,
+                               orientation: str = "portrait",
+                               dpi: Optional[Union[float, str]] = None) -> None:
+        """Replace a mapping, possibly under a new button ID, in one step"""
+        mapping = ButtonMapping(button_id, label_file, orientation, parse_dpi(dpi))
+        def mutate(config):
+            mappings = config.setdefault("button_mappings", {})
+            mappings.pop(old_button_id, None)
+            mappings[button_id] = mapping.to_dict()
+        self._update(mutate)
     
     def remove_button_mapping(self, button_id: str) -> None:
         """Remove a button mapping"""
-        if "button_mappings" in self.config and button_id in self.config["button_mappings"]:
-            del self.config["button_mappings"][button_id]
+        self._update(lambda config: config.get("button_mappings", {}).pop(button_id, None))
     
-    def get_button_mapping(self, button_id: str) -> Optional[Dict[str, str]]:
+    def get_button_mapping(self, button_id: str) -> Optional[Mapping[str, str]]:
         """Get specific button mapping with file and orientation"""
         mappings = self.get_button_mappings()
         return mappings.get(button_id)
     
     def update_button_mapping(self, button_id: str, label_file: str = None, orientation: str = None) -> None:
         """Update specific button mapping"""
-        if "button_mappings" not in self.config:
-            self.config["button_mappings"] = {}
-        
-        if button_id not in self.config["button_mappings"]:
-            self.config["button_mappings"][button_id] = {"file": "", "orientation": "portrait"}
-        
-        if label_file is not None:
-            self.config["button_mappings"][button_id]["file"] = label_file
-        if orientation is not None:
-            self.config["button_mappings"][button_id]["orientation"] = orientation
+        def mutate(config):
+            mappings = config.setdefault("button_mappings", {})
+            mapping = mappings.get(button_id)
+            if not isinstance(mapping, dict):
+                # Missing, or the old plain file path format
+                mapping = {"file": mapping or "", "orientation": "portrait"}
+                mappings[button_id] = mapping
+            if label_file is not None:
+                mapping["file"] = label_file
+            if orientation is not None:
+                mapping["orientation"] = orientation
+        self._update(mutate)
     
     def get_server_config(self) -> tuple[str, int]:
         """Get server host and port"""
+        snapshot = self._snapshot
         return (
-            self.config.get("server_host", "0.0.0.0"),
-            self.config.get("server_port", 5000)
+            snapshot.get("server_host", "0.0.0.0"),
+            snapshot.get("server_port", 5000)
         )
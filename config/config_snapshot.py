@@ -0,0 +1,38 @@
+import copy
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+from config.button_mapping import ButtonMapping
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only view of nested JSON data"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ConfigSnapshot:
+    """The whole configuration as it was at one moment; never modified after creation.
+
+    ConfigManager builds a new snapshot for every change and swaps it in with a
+    single assignment, so a reader that grabs one sees a consistent
+    configuration for as long as it holds on to it, without taking a lock.
+    """
+
+    __slots__ = ("version", "data", "mappings", "_raw")
+
+    def __init__(self, raw: Dict[str, Any], mappings: Dict[str, ButtonMapping], version: int = 0):
+        self.version = version
+        self.data: Mapping[str, Any] = _freeze(raw)
+        self.mappings: Mapping[str, ButtonMapping] = MappingProxyType(dict(mappings))
+        self._raw = raw
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A mutable deep copy of the configuration data"""
+        return copy.deepcopy(self._raw)
@@ -0,0 +1,108 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+def write_json_atomic(path: str, data: Dict[str, Any], backup_path: Optional[str] = None) -> None:
+    """Write JSON so that ``path`` always holds either the old or the new content.
+
+    The data goes to a temporary file in the same directory, is fsynced, and is
+    then renamed over the target. If ``backup_path`` is given and the current
+    file is valid JSON, it is kept there as the last known good copy.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if backup_path and os.path.exists(path):
+            _backup_if_valid(path, backup_path)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _backup_if_valid(path: str, backup_path: str) -> None:
+    try:
+        with open(path, 'r') as f:
+            json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return  # never replace a good backup with a corrupt file
+
+    temp_backup = backup_path + ".tmp"
+    shutil.copyfile(path, temp_backup)
+    os.replace(temp_backup, backup_path)
+
+
+class DebouncedConfigWriter:
+    """Coalesces bursts of config saves into one atomic write on a background thread.
+
+    The first save request arms a timer; further requests within ``debounce``
+    seconds ride along, and the data is read from ``get_data`` only when the
+    write actually happens, so the latest state is always the one persisted.
+    """
+
+    def __init__(self, path: str, get_data: Callable[[], Dict[str, Any]], debounce: float = 0.5,
+                 backup_path: Optional[str] = None, on_written: Optional[Callable[[], None]] = None):
+        self.path = path
+        self.debounce = debounce
+        self.backup_path = backup_path
+        self._get_data = get_data
+        self._on_written = on_written
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def schedule(self) -> None:
+        """Request a write; it happens at most ``debounce`` seconds from now"""
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.debounce, self._timer_fired)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def pending(self) -> bool:
+        with self._lock:
+            return self._timer is not None
+
+    def _timer_fired(self) -> None:
+        with self._lock:
+            self._timer = None
+        if not self.write_now():
+            # Try again later rather than losing the change
+            self.schedule()
+
+    def flush(self) -> bool:
+        """Write any pending change immediately"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is None:
+            # Nothing pending, but wait for a write that may be in progress
+            with self._write_lock:
+                return True
+        timer.cancel()
+        return self.write_now()
+
+    def write_now(self) -> bool:
+        """Write the current data synchronously"""
+        with self._write_lock:
+            try:
+                write_json_atomic(self.path, self._get_data(), self.backup_path)
+            except (IOError, OSError, TypeError, ValueError, RuntimeError) as e:
+                print(f"Error saving config: {e}")
+                return False
+            if self._on_written:
+                self._on_written()
+            return True
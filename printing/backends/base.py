@@ -0,0 +1,67 @@
+import os
+import logging
+from typing import Dict, FrozenSet, List, Optional
+
+from printing.bitmap_cache import PreparedLabel
+from printing.printer_session import PrinterSession
+
+# Backend capabilities
+CAP_BITMAP = "bitmap"              # prints rendered images
+CAP_RAW = "raw"                    # sends printer command bytes (ZPL, EPL, ...)
+CAP_BATCH_COPIES = "batch_copies"  # all copies of a label go out as one job
+CAP_STATUS = "status"              # printer_status() reports device or queue state
+
+
+class PrinterBackend:
+    """A way of reaching printers: lists the printers it can see and opens sessions to them.
+
+    Sessions do the actual printing and are pooled by PrinterSessionPool, so
+    open_session() may be slow. Backends are swappable, which lets the same
+    scheduling and caching code run against real spoolers, files or emulators.
+
+    When several backends can reach a printer, the one with the lowest
+    ``priority`` (the cheapest transport) is used unless a route says otherwise.
+    """
+
+    name = ""
+    priority = 100
+    capabilities: FrozenSet[str] = frozenset()
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def has_capability(self, capability: str) -> bool:
+        return capability in self.capabilities
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the backend can be used in this environment"""
+        return True
+
+    def enumerate_printers(self) -> List[str]:
+        """Names of the printers this backend can print to (may be slow)"""
+        raise NotImplementedError
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        """Open a connection to a printer"""
+        raise NotImplementedError
+
+    def document_name(self, prepared: PreparedLabel) -> str:
+        """Name of the spooler document a label is printed as"""
+        return prepared.source_path
+
+    def report_printed(self, printer_name: str, prepared: PreparedLabel, copies: int) -> None:
+        """Announce a finished print on the console"""
+        print(f"\n🖨️  SILENT PRINT SUCCESS!")
+        print(f"   📄 File: {os.path.basename(prepared.source_path)}")
+        print(f"   🖨️  Printer: {printer_name} ({self.name})")
+        print(f"   📐 Orientation: {prepared.orientation.title()}")
+        print(f"   🔢 Copies: {copies}")
+        print(f"   ✅ Print job sent automatically.\n")
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        """Device or queue state of a printer, or None if the backend cannot tell"""
+        return None
+
+    def close(self) -> None:
+        """Release resources held by the backend itself"""
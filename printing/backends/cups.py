@@ -0,0 +1,61 @@
+import io
+import shutil
+import platform
+import subprocess
+from typing import Dict, List, Optional
+
+from printing.backends.base import CAP_BATCH_COPIES, CAP_BITMAP, CAP_STATUS, PrinterBackend
+from printing.bitmap_cache import PreparedLabel
+from printing.printer_session import PrinterSession
+
+
+def _run(args: List[str], data: Optional[bytes] = None, timeout: float = 30.0) -> str:
+    result = subprocess.run(args, input=data, capture_output=True, timeout=timeout)
+    if result.returncode != 0:
+        raise IOError(f"{args[0]} failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout.decode(errors="replace")
+
+
+class CupsPrinterSession(PrinterSession):
+    """Submits labels to a CUPS queue with ``lp``; the driver scales them to the media"""
+
+    def __init__(self, printer_name: str, job_timeout: float = 30.0):
+        super().__init__(printer_name)
+        self.job_timeout = job_timeout
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        buffer = io.BytesIO()
+        prepared.image.save(buffer, 'PNG')
+        # One job; CUPS produces the copies itself
+        _run(["lp", "-d", self.printer_name, "-n", str(copies), "-t", doc_name,
+              "-o", "fit-to-page", "-"], buffer.getvalue(), self.job_timeout)
+        return copies
+
+
+class CupsBackend(PrinterBackend):
+    """Printers installed in CUPS (Linux/macOS), reached through the lp command line tools"""
+
+    name = "cups"
+    priority = 30
+    capabilities = frozenset({CAP_BITMAP, CAP_BATCH_COPIES, CAP_STATUS})
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return platform.system() != "Windows" and bool(shutil.which("lp")) and bool(shutil.which("lpstat"))
+
+    def enumerate_printers(self) -> List[str]:
+        output = _run(["lpstat", "-e"], timeout=10)
+        return [line.strip() for line in output.splitlines() if line.strip()]
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        return CupsPrinterSession(printer_name)
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        output = _run(["lpstat", "-p", printer_name, "-o", printer_name], timeout=10)
+        lines = output.splitlines()
+        state_line = next((line for line in lines if line.startswith(f"printer {printer_name} ")), "")
+        return {
+            "online": "disabled" not in state_line,
+            "state": state_line,
+            "queued_documents": sum(1 for line in lines if line.startswith(f"{printer_name}-")),
+        }
@@ -0,0 +1,50 @@
+import os
+from typing import List, Optional, Sequence
+
+from printing.backends.base import CAP_BATCH_COPIES, CAP_BITMAP, PrinterBackend
+from printing.bitmap_cache import PreparedLabel
+from printing.printer_session import MockPrinterSession, PrinterSession
+
+# Mock printers for development
+DEFAULT_MOCK_PRINTERS = [
+    "DYMO LabelWriter 4XL",
+    "DYMO LabelWriter 450",
+    "DYMO LabelWriter 450 Turbo",
+    "DYMO LabelWriter 450 Duo",
+    "HP LaserJet Pro",
+    "Canon PIXMA"
+]
+
+
+class MockBackend(PrinterBackend):
+    """Development printers that log jobs to files instead of printing"""
+
+    name = "mock"
+    priority = 90
+    capabilities = frozenset({CAP_BITMAP, CAP_BATCH_COPIES})
+
+    def __init__(self, output_dir: str = "mock_prints", printers: Optional[Sequence[str]] = None,
+                 store_images: bool = True):
+        super().__init__()
+        self.output_dir = output_dir
+        self.printers = list(printers) if printers is not None else list(DEFAULT_MOCK_PRINTERS)
+        self.store_images = store_images
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def enumerate_printers(self) -> List[str]:
+        return list(self.printers)
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        return MockPrinterSession(printer_name, self.output_dir, self.store_images)
+
+    def document_name(self, prepared: PreparedLabel) -> str:
+        name = os.path.splitext(os.path.basename(prepared.source_path))[0]
+        return f"{name}_{prepared.orientation}"
+
+    def report_printed(self, printer_name: str, prepared: PreparedLabel, copies: int) -> None:
+        print(f"\n🎨 MOCK PRINT SUCCESS!")
+        print(f"   📄 File: {os.path.basename(prepared.source_path)}")
+        print(f"   🖨️  Printer: {printer_name}")
+        print(f"   📐 Orientation: {prepared.orientation.title()}")
+        print(f"   🔢 Copies: {copies}")
+        print(f"   📂 Mock job log: {os.path.abspath(os.path.join(self.output_dir, MockPrinterSession.JOB_LOG))}\n")
@@ -0,0 +1,103 @@
+import platform
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from printing.backends.base import CAP_BATCH_COPIES, CAP_RAW, PrinterBackend
+from printing.bitmap_cache import PreparedLabel
+from printing.label_languages import LANGUAGES
+from printing.printer_session import PrinterSession
+
+
+def send_raw_win32(printer_name: str, data: bytes, doc_name: str) -> None:
+    """Hand bytes to the Windows spooler untouched (RAW datatype)"""
+    import win32print
+    handle = win32print.OpenPrinter(printer_name)
+    try:
+        win32print.StartDocPrinter(handle, 1, (doc_name, None, "RAW"))
+        try:
+            win32print.StartPagePrinter(handle)
+            win32print.WritePrinter(handle, data)
+            win32print.EndPagePrinter(handle)
+        finally:
+            win32print.EndDocPrinter(handle)
+    finally:
+        win32print.ClosePrinter(handle)
+
+
+def send_raw_lp(printer_name: str, data: bytes, doc_name: str) -> None:
+    """Send bytes to a CUPS queue without filtering"""
+    result = subprocess.run(["lp", "-d", printer_name, "-o", "raw", "-t", doc_name, "-"],
+                            input=data, capture_output=True, timeout=30)
+    if result.returncode != 0:
+        raise IOError(f"lp failed: {result.stderr.decode(errors='replace').strip()}")
+
+
+class RawPrinterSession(PrinterSession):
+    """Sends labels as printer command bytes instead of through the graphics driver.
+
+    The label program is encoded once per prepared label and cached on it, so a
+    print is a byte copy plus the language's quantity command.
+    """
+
+    def __init__(self, backend: "RawBackend", printer_name: str, language: str,
+                 printable_area: Optional[Tuple[int, int]] = None,
+                 dpi: Optional[Tuple[int, int]] = None):
+        super().__init__(printer_name)
+        self.backend = backend
+        self.language = LANGUAGES[language]
+        # Labels are sized for the media the driver reports, as for GDI printing
+        self.printable_area = printable_area
+        self.dpi = dpi
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        program = prepared.raw_program(self.language.name)
+        self.backend.send(self.printer_name, self.language.job(program, copies), doc_name)
+        return copies
+
+
+class RawBackend(PrinterBackend):
+    """Printers that accept a command language (ZPL, EPL, ...) written straight to the spooler.
+
+    This skips the graphics driver entirely, so it is the cheapest transport when
+    it applies. It reaches the printers of ``spooler`` (the Windows spooler or CUPS)
+    for which ``printer_languages`` names a known language (see label_languages).
+    """
+
+    name = "raw"
+    priority = 10
+    capabilities = frozenset({CAP_RAW, CAP_BATCH_COPIES})
+
+    def __init__(self, spooler: PrinterBackend, printer_languages: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.spooler = spooler
+        self.printer_languages = dict(printer_languages or {})
+        self.send = send_raw_win32 if platform.system() == "Windows" else send_raw_lp
+
+    def language_for(self, printer_name: str) -> Optional[str]:
+        language = self.printer_languages.get(printer_name)
+        return language if language in LANGUAGES else None
+
+    def enumerate_printers(self) -> List[str]:
+        return [name for name in self.spooler.enumerate_printers() if self.language_for(name)]
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        language = self.language_for(printer_name)
+        if language is None:
+            raise IOError(f"No raw command language configured for '{printer_name}'")
+        printable_area, dpi = self._device_metrics(printer_name)
+        return RawPrinterSession(self, printer_name, language, printable_area, dpi)
+
+    def _device_metrics(self, printer_name: str) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        """Media size and resolution as reported by the spooler's driver, if it can tell"""
+        try:
+            session = self.spooler.open_session(printer_name)
+        except Exception as e:
+            self.logger.warning(f"Could not read device metrics for '{printer_name}': {e}")
+            return None, None
+        try:
+            return session.printable_area, session.dpi
+        finally:
+            session.close()
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        return self.spooler.printer_status(printer_name)
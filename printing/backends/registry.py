@@ -0,0 +1,135 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Type
+
+from printing.backends.base import PrinterBackend
+from printing.backends.cups import CupsBackend
+from printing.backends.mock import MockBackend
+from printing.backends.raw import RawBackend
+from printing.backends.virtual_spooler import VirtualSpoolerBackend
+from printing.backends.win32_gdi import Win32GdiBackend
+
+# Backends that can be enabled by name (the raw backend wraps a spooler backend)
+BACKENDS: Dict[str, Type[PrinterBackend]] = {
+    Win32GdiBackend.name: Win32GdiBackend,
+    CupsBackend.name: CupsBackend,
+    MockBackend.name: MockBackend,
+    VirtualSpoolerBackend.name: VirtualSpoolerBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """Names of printer backends that can be used in this environment"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def create_backends(names: Optional[Sequence[str]] = None, mock_print_dir: str = "mock_prints",
+                    mock_printers: Optional[Sequence[str]] = None,
+                    printer_languages: Optional[Dict[str, str]] = None) -> List[PrinterBackend]:
+    """Instantiate printer backends.
+
+    With no ``names``, the Windows spooler is used (with a raw backend on
+    top) and mock printers everywhere else. CUPS is only used when named:
+    ``lp`` is installed on most Macs and Linux dev machines, which should keep
+    printing to mock printers unless told otherwise.
+    """
+    if not names:
+        names = [Win32GdiBackend.name if Win32GdiBackend.is_available() else MockBackend.name]
+
+    backends: List[PrinterBackend] = []
+    for name in names:
+        backend_class = BACKENDS.get(name)
+        if backend_class is None:
+            raise ValueError(f"Unknown printer backend '{name}'. Available: {', '.join(BACKENDS)}")
+        if not backend_class.is_available():
+            raise ImportError(f"Printer backend '{name}' is not available here")
+        if backend_class is MockBackend:
+            backend = MockBackend(mock_print_dir, mock_printers)
+        else:
+            backend = backend_class()
+        backends.append(backend)
+        if isinstance(backend, (Win32GdiBackend, CupsBackend)):
+            backends.append(RawBackend(backend, printer_languages))
+    return backends
+
+
+class BackendRegistry:
+    """Routes every printer to one backend.
+
+    Each enumeration records which backends can reach which printers. A printer
+    goes to the backend named for it in ``routes`` if that backend reaches it,
+    otherwise to the reaching backend with the lowest priority (the cheapest
+    transport).
+    """
+
+    def __init__(self, backends: Sequence[PrinterBackend], routes: Optional[Dict[str, str]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.backends = sorted(backends, key=lambda backend: backend.priority)
+        self._routes = dict(routes or {})
+        self._resolved: Dict[str, PrinterBackend] = {}
+        self._reachable: Dict[str, List[PrinterBackend]] = {}
+        self._lock = threading.Lock()
+
+    def enumerate_printers(self) -> List[str]:
+        """List printers across all backends and re-resolve their routes"""
+        reachable: Dict[str, List[PrinterBackend]] = {}
+        for backend in self.backends:
+            try:
+                printers = backend.enumerate_printers()
+            except Exception as e:
+                self.logger.error(f"Error enumerating printers via {backend.name}: {e}")
+                continue
+            for printer_name in printers:
+                reachable.setdefault(printer_name, []).append(backend)
+
+        with self._lock:
+            self._reachable = reachable
+            self._resolve()
+            return list(reachable)
+
+    def _resolve(self) -> None:
+        """Pick a backend per printer; caller must hold the lock"""
+        resolved = {}
+        for printer_name, candidates in self._reachable.items():
+            chosen = candidates[0]
+            wanted = self._routes.get(printer_name)
+            if wanted:
+                routed = [backend for backend in candidates if backend.name == wanted]
+                if routed:
+                    chosen = routed[0]
+                else:
+                    self.logger.warning(f"Route {printer_name} -> {wanted} ignored: "
+                                        f"backend does not reach that printer")
+            resolved[printer_name] = chosen
+        self._resolved = resolved
+
+    def set_routes(self, routes: Dict[str, str]) -> None:
+        """Replace the printer -> backend name overrides"""
+        with self._lock:
+            self._routes = dict(routes)
+            self._resolve()
+
+    def backend_for(self, printer_name: str) -> PrinterBackend:
+        """The backend a printer is routed to"""
+        with self._lock:
+            backend = self._resolved.get(printer_name)
+            enumerated = bool(self._reachable)
+        if backend is None and not enumerated:
+            self.enumerate_printers()
+            with self._lock:
+                backend = self._resolved.get(printer_name)
+        if backend is None:
+            raise LookupError(f"No printer backend reaches '{printer_name}'")
+        return backend
+
+    def routes(self) -> Dict[str, str]:
+        """Current printer -> backend name routing"""
+        with self._lock:
+            return {printer_name: backend.name for printer_name, backend in self._resolved.items()}
+
+    def open_session(self, printer_name: str):
+        return self.backend_for(printer_name).open_session(printer_name)
+
+    def close(self) -> None:
+        for backend in self.backends:
+            backend.close()
@@ -0,0 +1,253 @@
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from printing.backends.base import CAP_BATCH_COPIES, CAP_BITMAP, CAP_STATUS, PrinterBackend
+from printing.bitmap_cache import PreparedLabel
+from printing.printer_session import PrinterSession
+
+
+class VirtualPrintFault(IOError):
+    """An injected or simulated spooler/printer failure"""
+
+
+class VirtualDocument:
+    """One document as it moves through the virtual spooler"""
+
+    SPOOLED = "spooled"
+    PRINTING = "printing"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, printer_name: str, doc_name: str, pages: int, content_hash: str):
+        self.printer_name = printer_name
+        self.doc_name = doc_name
+        self.pages = pages
+        self.content_hash = content_hash
+        self.status = VirtualDocument.SPOOLED
+        self.pages_printed = 0
+        self.error: Optional[str] = None
+        # Set when an injected jam is assigned to this document at submission
+        self.jam = False
+        self.submitted_at = time.monotonic()
+        self.accepted_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+
+class _VirtualPrinter:
+    """Spool queue and device thread for one emulated printer"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.online = True
+        self.spool: Deque[VirtualDocument] = deque()
+        self.current: Optional[VirtualDocument] = None
+        self.faults: Deque[str] = deque()
+        self.printed_pages = 0
+        self.failed_documents = 0
+        self.thread: Optional[threading.Thread] = None
+
+
+class VirtualSpoolerSession(PrinterSession):
+    """Session that hands documents to the virtual spooler, like StartDoc/EndDoc would"""
+
+    def __init__(self, backend: "VirtualSpoolerBackend", printer_name: str):
+        super().__init__(printer_name)
+        self.backend = backend
+        self.printable_area = backend.printable_area
+        self.dpi = backend.dpi
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        self.backend.submit(self.printer_name, prepared, copies, doc_name)
+        return copies
+
+
+class VirtualSpoolerBackend(PrinterBackend):
+    """Emulates a Windows spooler feeding label printers, for timing work on any OS.
+
+    Submitting a document takes ``accept_seconds`` (plus ``accept_seconds_per_page``)
+    like StartDoc..EndDoc does, then returns while the printer works through its
+    spool queue at ``page_seconds`` per page. When ``spool_limit`` documents are
+    waiting, submitting blocks for up to ``spool_timeout`` seconds and then fails.
+
+    Faults can be injected per printer with inject_fault() or at random with
+    ``fault_rate``; the random generator is seeded, so runs are repeatable.
+    ``time_scale`` multiplies every delay (0 makes the emulation instant).
+    """
+
+    name = "virtual"
+    priority = 80
+    capabilities = frozenset({CAP_BITMAP, CAP_BATCH_COPIES, CAP_STATUS})
+
+    # Fault kinds for inject_fault()
+    SPOOL_ERROR = "spool_error"  # the next submission raises
+    JAM = "jam"                  # the next document stops after its first page
+
+    def __init__(self, printers: Sequence[str] = ("Virtual Label Printer",),
+                 page_seconds: float = 0.5, accept_seconds: float = 0.05,
+                 accept_seconds_per_page: float = 0.0, spool_limit: int = 8,
+                 spool_timeout: float = 5.0,
+                 printable_area: Optional[Tuple[int, int]] = (1200, 1800),
+                 dpi: Tuple[int, int] = (300, 300), fault_rate: float = 0.0,
+                 seed: int = 0, time_scale: float = 1.0, max_history: int = 10000):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.page_seconds = page_seconds
+        self.accept_seconds = accept_seconds
+        self.accept_seconds_per_page = accept_seconds_per_page
+        self.spool_limit = spool_limit
+        self.spool_timeout = spool_timeout
+        self.printable_area = printable_area
+        self.dpi = dpi
+        self.fault_rate = fault_rate
+        self.time_scale = time_scale
+        self.documents: Deque[VirtualDocument] = deque(maxlen=max_history)
+
+        self._random = random.Random(seed)
+        self._printers: Dict[str, _VirtualPrinter] = {name: _VirtualPrinter(name) for name in printers}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0 and self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def _printer(self, printer_name: str) -> _VirtualPrinter:
+        printer = self._printers.get(printer_name)
+        if printer is None:
+            raise VirtualPrintFault(f"Unknown virtual printer '{printer_name}'")
+        return printer
+
+    def enumerate_printers(self) -> List[str]:
+        with self._condition:
+            return [name for name, printer in self._printers.items() if printer.online]
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        with self._condition:
+            if not self._printer(printer_name).online:
+                raise VirtualPrintFault(f"Printer '{printer_name}' is offline")
+        return VirtualSpoolerSession(self, printer_name)
+
+    def submit(self, printer_name: str, prepared: PreparedLabel, copies: int,
+               doc_name: str) -> VirtualDocument:
+        """Spool a document; returns once the spooler has accepted it"""
+        document = VirtualDocument(printer_name, doc_name, copies, prepared.content_hash())
+        self._sleep(self.accept_seconds + self.accept_seconds_per_page * copies)
+
+        deadline = time.monotonic() + self.spool_timeout
+        with self._condition:
+            printer = self._printer(printer_name)
+            if not printer.online:
+                raise VirtualPrintFault(f"Printer '{printer_name}' is offline")
+            if printer.faults and printer.faults[0] == self.SPOOL_ERROR:
+                printer.faults.popleft()
+                raise VirtualPrintFault(f"Injected spool error on '{printer_name}'")
+            if self.fault_rate and self._random.random() < self.fault_rate:
+                raise VirtualPrintFault(f"Random spool error on '{printer_name}'")
+
+            while len(printer.spool) >= self.spool_limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    raise VirtualPrintFault(
+                        f"Spool queue for '{printer_name}' is full ({self.spool_limit} documents)"
+                    )
+                self._condition.wait(remaining)
+
+            if printer.faults and printer.faults[0] == self.JAM:
+                printer.faults.popleft()
+                document.jam = True
+            document.accepted_at = time.monotonic()
+            printer.spool.append(document)
+            self.documents.append(document)
+            if printer.thread is None:
+                printer.thread = threading.Thread(
+                    target=self._run_printer, args=(printer,),
+                    name=f"virtual-printer[{printer_name}]", daemon=True
+                )
+                printer.thread.start()
+            self._condition.notify_all()
+        return document
+
+    def _run_printer(self, printer: _VirtualPrinter) -> None:
+        """Device loop: print spooled documents one page at a time"""
+        while True:
+            with self._condition:
+                while not printer.spool and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                document = printer.spool[0]
+                printer.current = document
+                document.status = VirtualDocument.PRINTING
+                document.started_at = time.monotonic()
+
+            for page in range(document.pages):
+                self._sleep(self.page_seconds)
+                with self._condition:
+                    document.pages_printed += 1
+                    printer.printed_pages += 1
+                if document.jam:
+                    break
+
+            with self._condition:
+                printer.spool.popleft()
+                printer.current = None
+                document.finished_at = time.monotonic()
+                if document.jam:
+                    document.status = VirtualDocument.FAILED
+                    document.error = "Paper jam"
+                    printer.failed_documents += 1
+                    self.logger.warning(f"Virtual printer '{printer.name}' jammed on {document.doc_name}")
+                else:
+                    document.status = VirtualDocument.DONE
+                self._condition.notify_all()
+
+    def inject_fault(self, printer_name: str, kind: str, count: int = 1) -> None:
+        """Make the next ``count`` documents submitted to a printer fail with ``kind``.
+
+        A spool error rejects the submission; a jam stops the document after
+        its first page and marks it failed.
+        """
+        if kind not in (self.SPOOL_ERROR, self.JAM):
+            raise ValueError(f"Unknown fault kind '{kind}'")
+        with self._condition:
+            self._printer(printer_name).faults.extend([kind] * count)
+
+    def set_online(self, printer_name: str, online: bool) -> None:
+        """Take a printer offline (hidden from enumeration, submissions fail) or back online"""
+        with self._condition:
+            self._printer(printer_name).online = online
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        with self._condition:
+            printer = self._printers.get(printer_name)
+            if printer is None:
+                return None
+            return {
+                "online": printer.online,
+                "queued_documents": len(printer.spool),
+                "queued_pages": sum(doc.pages - doc.pages_printed for doc in printer.spool),
+                "printing": printer.current.doc_name if printer.current else None,
+                "printed_pages": printer.printed_pages,
+                "failed_documents": printer.failed_documents,
+            }
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Wait until every spool queue is empty; False if the timeout expired"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while any(printer.spool for printer in self._printers.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
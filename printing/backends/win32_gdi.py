@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+
+from printing.backends.base import CAP_BATCH_COPIES, CAP_BITMAP, CAP_STATUS, PrinterBackend
+from printing.printer_session import PrinterSession, Win32PrinterSession
+
+
+class Win32GdiBackend(PrinterBackend):
+    """Windows printers driven through the spooler and a GDI device context"""
+
+    name = "win32_gdi"
+    priority = 20
+    capabilities = frozenset({CAP_BITMAP, CAP_BATCH_COPIES, CAP_STATUS})
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import win32print  # noqa: F401
+            import win32ui  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def enumerate_printers(self) -> List[str]:
+        import win32print
+        printers = []
+        for printer_info in win32print.EnumPrinters(
+            win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
+        ):
+            printers.append(printer_info[2])  # printer_info[2] is the printer name
+        return printers
+
+    def open_session(self, printer_name: str) -> PrinterSession:
+        return Win32PrinterSession(printer_name)
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        import win32print
+        handle = win32print.OpenPrinter(printer_name)
+        try:
+            info = win32print.GetPrinter(handle, 2)
+        finally:
+            win32print.ClosePrinter(handle)
+        return {
+            "online": not info["Status"] & win32print.PRINTER_STATUS_OFFLINE,
+            "status_flags": info["Status"],
+            "queued_documents": info["cJobs"],
+        }
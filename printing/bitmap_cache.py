@@ -0,0 +1,137 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from PIL import Image
+
+
+class PreparedLabel:
+    """A label rotated and scaled to a printer's device resolution, ready to blit.
+
+    ``box`` is where the image goes on the page; its size equals the image size,
+    so drawing it needs no resampling.
+    """
+
+    def __init__(self, source_path: str, orientation: str, image: Image.Image,
+                 box: Tuple[int, int, int, int]):
+        self.source_path = source_path
+        self.orientation = orientation
+        self.image = image
+        self.box = box
+        self._dib = None
+        self._programs: Dict[str, bytes] = {}
+        self._content_hash: Optional[str] = None
+
+    def dib(self):
+        """Return a cached ImageWin.Dib of the image (Windows only)"""
+        if self._dib is None:
+            from PIL import ImageWin
+            self._dib = ImageWin.Dib(self.image)
+        return self._dib
+
+    def raw_program(self, language: str) -> bytes:
+        """Return the cached printer command program for one copy of the label"""
+        program = self._programs.get(language)
+        if program is None:
+            from printing.label_languages import LANGUAGES
+            program = LANGUAGES[language].encode(self.image, self.box[:2])
+            self._programs[language] = program
+        return program
+
+    def content_hash(self) -> str:
+        """SHA-256 of the pixel data, computed once; equal renders share a hash"""
+        if self._content_hash is None:
+            digest = hashlib.sha256(f"{self.image.mode}:{self.image.size}:".encode())
+            digest.update(self.image.tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the image, its DIB copy and command programs"""
+        width, height = self.image.size
+        if self.image.mode == "1":
+            size = (width + 7) // 8 * height
+        else:
+            size = width * height * len(self.image.getbands())
+        if self._dib is not None:
+            size *= 2
+        return size + sum(len(program) for program in self._programs.values())
+
+
+class PreparedBitmapCache:
+    """In-memory LRU of PreparedLabel objects with a byte budget.
+
+    Keys include the source file's mtime and the printer's printable area, so a
+    changed label or printer setting simply misses and gets prepared again.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[Hashable, PreparedLabel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(source_path: str, printer_name: str, orientation: str,
+                 printable_area: Optional[Tuple[int, int]], dpi: Optional[float] = None) -> Tuple:
+        """Build a cache key; raises OSError if the source file is missing"""
+        st = os.stat(source_path)
+        return (os.path.abspath(source_path), st.st_mtime_ns, st.st_size,
+                printer_name, orientation.lower(), printable_area, dpi)
+
+    def get(self, key: Tuple) -> Optional[PreparedLabel]:
+        with self._lock:
+            prepared = self._entries.get(key)
+            if prepared is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prepared
+
+    def put(self, key: Tuple, prepared: PreparedLabel) -> None:
+        with self._lock:
+            # Any older version of the same label/printer/orientation/DPI is now stale
+            for old_key in [k for k in self._entries
+                            if k[0] == key[0] and k[3:5] == key[3:5] and k[6:] == key[6:]]:
+                del self._entries[old_key]
+            self._entries[key] = prepared
+            self._evict(keep=key)
+
+    def _total_bytes(self) -> int:
+        return sum(p.nbytes for p in self._entries.values())
+
+    def _evict(self, keep: Tuple) -> None:
+        """Drop least recently used labels until under budget; caller must hold the lock"""
+        total = self._total_bytes()
+        while total > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            total -= self._entries.pop(key).nbytes
+            self.logger.debug(f"Evicted prepared bitmap for {key[0]} on {key[3]}")
+
+    def invalidate(self, source_path: Optional[str] = None, printer_name: Optional[str] = None) -> None:
+        """Drop prepared labels for one file and/or printer, or everything"""
+        abs_path = os.path.abspath(source_path) if source_path else None
+        with self._lock:
+            for key in list(self._entries):
+                if (abs_path is None or key[0] == abs_path) and \
+                        (printer_name is None or key[3] == printer_name):
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,119 @@
+import base64
+import binascii
+import zlib
+from typing import Dict, Tuple
+from PIL import Image
+
+from printing.monochrome import dither, pack_rows
+
+
+def pack_1bpp(image: Image.Image, dot_bit: int = 1) -> Tuple[bytes, int, int]:
+    """Pack a label to 1 bit per pixel; 1-bit labels are used as they are, others thresholded.
+
+    ``dot_bit`` is the bit value that prints a dot (1 for ZPL and DYMO, 0 for EPL).
+    Returns ``(data, bytes_per_row, rows)``.
+    """
+    dots = dither(image, "threshold")
+    data, bytes_per_row = pack_rows(dots, dot_bit)
+    return data, bytes_per_row, dots.shape[0]
+
+
+class LabelLanguage:
+    """Turns a prepared label into a printer command language.
+
+    Encoding is split in two so the expensive part is done once per label:
+    ``encode()`` builds the program for one label from the image (cached on the
+    PreparedLabel), and ``job()`` wraps it for a number of copies, which is only
+    string work.
+    """
+
+    name = ""
+    # Whether the language has a print quantity command
+    native_copies = False
+
+    def encode(self, image: Image.Image, origin: Tuple[int, int]) -> bytes:
+        raise NotImplementedError
+
+    def job(self, program: bytes, copies: int) -> bytes:
+        return program * copies
+
+
+class ZplLanguage(LabelLanguage):
+    """Zebra ZPL II: one ^GF graphic field, zlib-compressed (Z64), with ^PQ for copies"""
+
+    name = "zpl"
+    native_copies = True
+
+    def encode(self, image: Image.Image, origin: Tuple[int, int]) -> bytes:
+        data, bytes_per_row, _ = pack_1bpp(image, dot_bit=1)
+        encoded = base64.b64encode(zlib.compress(data, 9))
+        crc = binascii.crc_hqx(encoded, 0)
+        return (b"^XA^LH0,0^FO%d,%d^GFA,%d,%d,%d,:Z64:%s:%04x^FS"
+                % (origin[0], origin[1], len(data), len(data), bytes_per_row, encoded, crc))
+
+    def job(self, program: bytes, copies: int) -> bytes:
+        return program + b"^PQ%d^XZ\n" % copies
+
+
+class EplLanguage(LabelLanguage):
+    """Eltron/Zebra EPL2: a GW graphic (0 bits print) and P for copies"""
+
+    name = "epl"
+    native_copies = True
+
+    def encode(self, image: Image.Image, origin: Tuple[int, int]) -> bytes:
+        data, bytes_per_row, rows = pack_1bpp(image, dot_bit=0)
+        return b"\nN\nGW%d,%d,%d,%d," % (origin[0], origin[1], bytes_per_row, rows) + data + b"\n"
+
+    def job(self, program: bytes, copies: int) -> bytes:
+        return program + b"P%d\n" % copies
+
+
+class DymoLanguage(LabelLanguage):
+    """DYMO LabelWriter raster commands: one line per dot row, blank rows skipped.
+
+    The LabelWriter has no quantity command, so copies repeat the program.
+    """
+
+    name = "dymo"
+
+    ESC = b"\x1b"
+    SYN = b"\x16"
+    MAX_SKIP = 255
+
+    def encode(self, image: Image.Image, origin: Tuple[int, int]) -> bytes:
+        data, bytes_per_row, rows = pack_1bpp(image, dot_bit=1)
+        left_bytes = origin[0] // 8
+        line_bytes = left_bytes + bytes_per_row
+        if line_bytes > 255:
+            raise ValueError(f"Label is too wide for DYMO raster lines ({line_bytes} bytes)")
+
+        out = [self.ESC + b"@", self.ESC + b"D" + bytes([line_bytes]),
+               self.ESC + b"L" + (origin[1] + rows).to_bytes(2, "big")]
+        blank_row = bytes(bytes_per_row)
+        padding = bytes(left_bytes)
+        skip = origin[1]
+        for row in range(rows):
+            line = data[row * bytes_per_row:(row + 1) * bytes_per_row]
+            if line == blank_row:
+                skip += 1
+                continue
+            out.append(self._skip(skip))
+            skip = 0
+            out.append(self.SYN + padding + line)
+        out.append(self.ESC + b"E")
+        return b"".join(out)
+
+    def _skip(self, lines: int) -> bytes:
+        """Feed blank lines without sending their data"""
+        commands = []
+        while lines > 0:
+            step = min(lines, self.MAX_SKIP)
+            commands.append(self.ESC + b"f\x01" + bytes([step]))
+            lines -= step
+        return b"".join(commands)
+
+
+LANGUAGES: Dict[str, LabelLanguage] = {
+    language.name: language for language in (ZplLanguage(), EplLanguage(), DymoLanguage())
+}
@@ -0,0 +1,240 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow spooler calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    """Bucket counts for one label set; the arrays are allocated once, up front"""
+
+    __slots__ = ("_bounds", "_counts", "_sum", "_count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+
+class Metric:
+    """Base for metrics with an optional fixed set of label names.
+
+    Children are created per label value set on first use; callers on hot
+    paths should look a child up once and keep it.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _render_samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+                for values, child in self._items()]
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (math.inf,)
+        for values, child in self._items():
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """A metric whose samples are read from ``callback`` when metrics are scraped.
+
+    The callback returns ``{label_values_tuple: value}``. Use it for values
+    that something else already tracks, such as queue depths or cache counters.
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Dict[Tuple[str, ...], float]],
+                 labelnames: Sequence[str] = (), type_name: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def _render_samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+                for values, value in self.callback().items()]
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric; a metric registered under the same name is replaced"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "label_print_stage_seconds", "Time spent in each stage of the print pipeline", ("stage",)
+))
+END_TO_END_SECONDS = REGISTRY.register(Histogram(
+    "label_print_end_to_end_seconds", "Time from request to last copy spooled, per button", ("button_id",)
+))
+PRINT_REQUESTS = REGISTRY.register(Counter(
+    "label_print_requests_total", "Print requests by endpoint and HTTP status", ("endpoint", "status")
+))
+COPIES_PRINTED = REGISTRY.register(Counter(
+    "label_copies_printed_total", "Label copies spooled, per printer", ("printer",)
+))
+COPIES_FAILED = REGISTRY.register(Counter(
+    "label_copies_failed_total", "Requested label copies that were not printed, per printer", ("printer",)
+))
+
+# Children for the fixed pipeline stages, so hot paths skip the label lookup
+MAPPING_LOOKUP_SECONDS = STAGE_SECONDS.labels("mapping_lookup")
+SVG_CONVERT_SECONDS = STAGE_SECONDS.labels("svg_convert")
+IMAGE_PREP_SECONDS = STAGE_SECONDS.labels("image_prep")
+SPOOL_SECONDS = STAGE_SECONDS.labels("spool")
+
+
+def cache_metrics(caches: Iterable[Tuple[str, object]]) -> List[Metric]:
+    """Hit/miss counts and hit ratio for caches exposing a ``stats()`` dict"""
+    caches = list(caches)
+
+    def read(field):
+        def collect():
+            samples = {}
+            for name, cache in caches:
+                stats = cache.stats()
+                if field == "hit_ratio":
+                    lookups = stats["hits"] + stats["misses"]
+                    samples[(name,)] = stats["hits"] / lookups if lookups else 0.0
+                else:
+                    samples[(name,)] = stats[field]
+            return samples
+        return collect
+
+    return [
+        CallbackMetric("label_cache_hits_total", "Cache hits since start", read("hits"), ("cache",), "counter"),
+        CallbackMetric("label_cache_misses_total", "Cache misses since start", read("misses"), ("cache",), "counter"),
+        CallbackMetric("label_cache_hit_ratio", "Share of cache lookups that hit", read("hit_ratio"), ("cache",)),
+        CallbackMetric("label_cache_bytes", "Bytes held by the cache", read("bytes"), ("cache",)),
+    ]
@@ -0,0 +1,181 @@
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Ways of turning gray levels into dots. "threshold" suits text and barcodes;
+# the others trade edge sharpness for smoother gray areas (logos, photos).
+DITHER_METHODS = ("threshold", "floyd_steinberg", "atkinson", "bayer")
+
+# Gray level below which a pixel prints as a dot
+THRESHOLD = 128
+
+_BAYER_4X4 = np.array([[0, 8, 2, 10],
+                       [12, 4, 14, 6],
+                       [3, 11, 1, 9],
+                       [15, 7, 13, 5]], dtype=np.float32)
+
+
+def gray_levels(image: Image.Image) -> np.ndarray:
+    """The image as a uint8 gray array, with transparency composited on white"""
+    if image.mode in ("RGBA", "LA"):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    return np.asarray(image.convert("L"))
+
+
+def dither(image: Image.Image, method: str = "threshold") -> np.ndarray:
+    """Return a boolean array that is True where the printer should place a dot"""
+    if image.mode == "1":
+        return ~np.asarray(image)
+    if method not in DITHER_METHODS:
+        raise ValueError(f"Unknown dithering method '{method}'. Available: {', '.join(DITHER_METHODS)}")
+
+    if method == "floyd_steinberg":
+        # Pillow's error diffusion runs in C and is Floyd-Steinberg
+        return ~np.asarray(image.convert("L").convert("1", dither=Image.Dither.FLOYDSTEINBERG))
+
+    gray = gray_levels(image)
+    if method == "threshold":
+        return gray < THRESHOLD
+    if method == "bayer":
+        height, width = gray.shape
+        thresholds = (_BAYER_4X4 + 0.5) * (256.0 / 16)
+        tiled = np.tile(thresholds, (math.ceil(height / 4), math.ceil(width / 4)))[:height, :width]
+        return gray < tiled
+    return _atkinson(gray)
+
+
+def _atkinson(gray: np.ndarray) -> np.ndarray:
+    """Atkinson error diffusion (3/4 of the error spread over six neighbours).
+
+    Error diffusion is sequential along a row, so only pixels that carry an
+    error are visited in Python; pure black or white pixels that receive no
+    error are thresholded for the whole row at once. Label art is mostly such
+    pixels, which keeps this fast where it matters; rows that are mostly gray
+    go through a plain loop instead.
+    """
+    height, width = gray.shape
+    # Two extra rows below and a column of margin on both sides
+    work = np.zeros((height + 2, width + 4), dtype=np.float32)
+    work[:height, 2:width + 2] = gray
+    dots = np.empty((height, width), dtype=bool)
+
+    for y in range(height):
+        row = work[y, 2:width + 2]
+        dots[y] = row < THRESHOLD
+        impure = np.flatnonzero((row != 0) & (row != 255))
+        if impure.size == 0:
+            continue
+
+        if impure.size > width // 4:
+            _diffuse_row(row, work[y + 1], work[y + 2], dots[y])
+            continue
+
+        values = row.tolist()
+        below = work[y + 1]
+        below2 = work[y + 2]
+        carry: Dict[int, float] = {}
+        columns = impure.tolist()
+        index = 0
+        while index < len(columns) or carry:
+            x = columns[index] if index < len(columns) else width
+            if carry:
+                x = min(x, min(carry))
+            if index < len(columns) and columns[index] == x:
+                index += 1
+            if x >= width:
+                break
+
+            value = values[x] + carry.pop(x, 0.0)
+            dot = value < THRESHOLD
+            dots[y, x] = dot
+            error = (value - (0.0 if dot else 255.0)) / 8.0
+            if error:
+                carry[x + 1] = carry.get(x + 1, 0.0) + error
+                carry[x + 2] = carry.get(x + 2, 0.0) + error
+                below[x + 1:x + 4] += error  # x-1, x, x+1 in image coordinates
+                below2[x + 2] += error
+    return dots
+
+
+def _diffuse_row(row: np.ndarray, below: np.ndarray, below2: np.ndarray, dots: np.ndarray) -> None:
+    """Atkinson for a row that is mostly gray: every pixel, on plain Python lists"""
+    width = row.shape[0]
+    values = row.tolist()
+    spread = [0.0] * (width + 4)   # error for the row below, offset by 2 like ``work``
+    spread2 = [0.0] * (width + 4)
+    row_dots = [False] * width
+    next1 = next2 = 0.0
+    for x in range(width):
+        value = values[x] + next1
+        dot = value < THRESHOLD
+        row_dots[x] = dot
+        error = (value - (0.0 if dot else 255.0)) / 8.0
+        next1 = next2 + error
+        next2 = error
+        if error:
+            spread[x + 1] += error
+            spread[x + 2] += error
+            spread[x + 3] += error
+            spread2[x + 2] += error
+    dots[:] = row_dots
+    below += np.asarray(spread, dtype=np.float32)
+    below2 += np.asarray(spread2, dtype=np.float32)
+
+
+def to_image(dots: np.ndarray) -> Image.Image:
+    """A mode "1" image of a dot mask (dots are black)"""
+    return Image.fromarray(~dots)
+
+
+def to_monochrome(image: Image.Image, method: str = "threshold") -> Image.Image:
+    """Reduce a label to a 1-bit image, at 1/24 the memory of RGB"""
+    if image.mode == "1":
+        return image
+    return to_image(dither(image, method))
+
+
+def pack_rows(dots: np.ndarray, dot_bit: int = 1) -> Tuple[bytes, int]:
+    """Pack a dot mask to 1 bit per pixel, MSB first, rows padded to whole bytes.
+
+    ``dot_bit`` is the bit value that places a dot; padding bits never do.
+    Returns ``(data, bytes_per_row)``.
+    """
+    height, width = dots.shape
+    padded_width = (width + 7) // 8 * 8
+    if padded_width != width:
+        dots = np.pad(dots, ((0, 0), (0, padded_width - width)))
+    bits = dots if dot_bit else ~dots
+    return np.packbits(bits, axis=1).tobytes(), padded_width // 8
+
+
+def fidelity(reference: Image.Image, mono: Image.Image, scale: int = 4) -> Dict[str, float]:
+    """Compare a 1-bit label with the gray/RGB label it was made from.
+
+    Both are averaged over ``scale`` x ``scale`` blocks first, which roughly
+    matches how dots blend when the label is looked at. Returns the mean
+    absolute tone error and PSNR of the blurred images, and the difference in
+    overall ink coverage (0..1, lower is better).
+    """
+    if reference.size != mono.size:
+        raise ValueError(f"Size mismatch: {reference.size} vs {mono.size}")
+    original = gray_levels(reference).astype(np.float32) / 255.0
+    printed = (~dither(mono)).astype(np.float32)
+
+    def blur(levels: np.ndarray) -> np.ndarray:
+        height, width = levels.shape
+        height -= height % scale
+        width -= width % scale
+        blocks = levels[:height, :width].reshape(height // scale, scale, width // scale, scale)
+        return blocks.mean(axis=(1, 3))
+
+    difference = blur(original) - blur(printed)
+    mse = float(np.mean(difference ** 2))
+    return {
+        "tone_error": float(np.mean(np.abs(difference))),
+        "psnr_db": float("inf") if mse == 0 else 10.0 * math.log10(1.0 / mse),
+        "coverage_error": abs(float(original.mean()) - float(printed.mean())),
+    }
@@ -0,0 +1,70 @@
+import time
+import uuid
+from typing import Any, Dict, Optional, Union
+
+
+def new_group_id() -> str:
+    return uuid.uuid4().hex
+
+
+class PrintError(IOError):
+    """A print that failed; ``printed`` counts the copies that went out before it did"""
+
+    def __init__(self, message: str, printed: int = 0):
+        super().__init__(message)
+        self.printed = printed
+
+
+class PrintJob:
+    """A single print request: one label, one printer, N copies.
+
+    Jobs submitted together from one batch request share a ``group_id``.
+    """
+
+    QUEUED = "queued"
+    PRINTING = "printing"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, button_id: str, label_file: str, printer_name: str,
+                 orientation: str = "portrait", quantity: int = 1,
+                 dpi: Optional[Union[float, str]] = None):
+        self.id = uuid.uuid4().hex
+        self.button_id = button_id
+        self.label_file = label_file
+        self.printer_name = printer_name
+        self.orientation = orientation
+        self.quantity = quantity
+        self.dpi = dpi
+        self.group_id: Optional[str] = None
+
+        self.status = PrintJob.QUEUED
+        self.printed = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def is_finished(self) -> bool:
+        return self.status in (PrintJob.DONE, PrintJob.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize job state for the HTTP API"""
+        return {
+            "job_id": self.id,
+            "group_id": self.group_id,
+            "button_id": self.button_id,
+            "label_file": self.label_file,
+            "printer": self.printer_name,
+            "orientation": self.orientation,
+            "dpi": self.dpi,
+            "status": self.status,
+            "requested_quantity": self.quantity,
+            "printed": self.printed,
+            "failed": self.failed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
@@ -0,0 +1,202 @@
+import time
+import queue
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from printing.metrics import COPIES_FAILED, COPIES_PRINTED, END_TO_END_SECONDS
+from printing.print_jobs import PrintError, PrintJob, new_group_id
+
+
+class SchedulerFullError(Exception):
+    """Raised when a printer's queue cannot accept another job"""
+
+    def __init__(self, printer_name: str, capacity: int):
+        super().__init__(f"Print queue for '{printer_name}' is full ({capacity} jobs)")
+        self.printer_name = printer_name
+        self.capacity = capacity
+
+
+class PrinterWorker:
+    """Serialized worker thread for one physical printer.
+
+    Jobs for the printer run strictly one after another in submission order,
+    so pages from different jobs can never interleave on the device.
+    """
+
+    def __init__(self, printer_name: str, printer_manager, max_queue: int):
+        self.printer_name = printer_name
+        self.printer_manager = printer_manager
+        self.max_queue = max_queue
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: "queue.Queue[PrintJob]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._run, name=f"print-worker[{printer_name}]", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, job: PrintJob) -> None:
+        """Queue a job without blocking; raises SchedulerFullError when full"""
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise SchedulerFullError(self.printer_name, self.max_queue)
+
+    def depth(self) -> int:
+        """Number of jobs waiting for this printer"""
+        return self._queue.qsize()
+
+    def free_slots(self) -> int:
+        """How many more jobs the queue can take right now"""
+        return self.max_queue - self._queue.qsize()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Wait until every queued job has finished; False if the timeout expired"""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: PrintJob) -> None:
+        job.status = PrintJob.PRINTING
+        job.started_at = time.time()
+        try:
+            printed = self.printer_manager.print_image_batch(
+                job.label_file, job.printer_name, job.orientation, job.quantity, job.dpi
+            )
+        except PrintError as e:
+            printed = e.printed
+            job.error = str(e)
+        except Exception as e:
+            printed = 0
+            job.error = str(e)
+
+        job.printed = printed
+        job.failed = job.quantity - printed
+        job.finished_at = time.time()
+
+        END_TO_END_SECONDS.labels(job.button_id).observe(job.finished_at - job.created_at)
+        COPIES_PRINTED.labels(job.printer_name).inc(printed)
+        if job.failed:
+            COPIES_FAILED.labels(job.printer_name).inc(job.failed)
+        if job.failed == 0:
+            job.status = PrintJob.DONE
+            self.logger.info(f"Printed {printed}/{job.quantity} for button {job.button_id}: "
+                             f"{job.label_file} ({job.orientation})")
+        else:
+            job.status = PrintJob.FAILED
+            if job.error is None:
+                job.error = f"Printed {printed} of {job.quantity} requested"
+            self.logger.error(f"Partial/failed prints {printed}/{job.quantity} for button "
+                              f"{job.button_id}: {job.label_file}")
+
+
+class PrintScheduler:
+    """Routes print jobs to one serialized worker per printer.
+
+    Workers for different printers run in parallel. Each printer has a bounded
+    queue; when it is full, submit() raises SchedulerFullError so the HTTP
+    layer can push back instead of buffering without limit. Finished jobs are
+    kept (up to ``max_history``) so their outcome can still be queried.
+    """
+
+    def __init__(self, printer_manager, max_queue_per_printer: int = 20, max_history: int = 500):
+        self.printer_manager = printer_manager
+        self.max_queue_per_printer = max_queue_per_printer
+        self.max_history = max_history
+        self.logger = logging.getLogger(__name__)
+
+        self._workers: Dict[str, PrinterWorker] = {}
+        self._jobs: "OrderedDict[str, PrintJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_worker(self, printer_name: str) -> PrinterWorker:
+        """Return the worker for a printer, starting it on first use; caller must hold the lock"""
+        worker = self._workers.get(printer_name)
+        if worker is None:
+            worker = PrinterWorker(printer_name, self.printer_manager, self.max_queue_per_printer)
+            self._workers[printer_name] = worker
+            self.logger.info(f"Started print worker for '{printer_name}'")
+        return worker
+
+    def submit(self, job: PrintJob) -> PrintJob:
+        """Queue a job on its printer's worker and return it"""
+        with self._lock:
+            self._get_worker(job.printer_name).submit(job)
+            self._jobs[job.id] = job
+            self._trim_history()
+        self.logger.info(f"Queued job {job.id}: {job.quantity}x {job.label_file} -> {job.printer_name}")
+        return job
+
+    def submit_group(self, jobs: List[PrintJob]) -> str:
+        """Queue several jobs as one group and return the group ID.
+
+        Admission is all-or-nothing: if any printer's queue lacks room for its
+        share of the group, SchedulerFullError is raised and nothing is queued.
+        Jobs of a group are queued back to back, so on each printer they print
+        in the given order without other jobs in between.
+        """
+        group_id = new_group_id()
+        with self._lock:
+            # Only submitters add to the queues and they hold the lock, so the
+            # free space can only grow between this check and the puts below
+            for printer_name, count in Counter(job.printer_name for job in jobs).items():
+                worker = self._get_worker(printer_name)
+                if worker.free_slots() < count:
+                    raise SchedulerFullError(printer_name, worker.max_queue)
+            for job in jobs:
+                job.group_id = group_id
+                self._workers[job.printer_name].submit(job)
+                self._jobs[job.id] = job
+            self._trim_history()
+        self.logger.info(f"Queued job group {group_id} with {len(jobs)} jobs")
+        return group_id
+
+    def get_job(self, job_id: str) -> Optional[PrintJob]:
+        """Look up a queued, running or recently finished job"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Number of waiting jobs per printer"""
+        with self._lock:
+            return {name: worker.depth() for name, worker in self._workers.items()}
+
+    def pending_count(self) -> int:
+        """Total number of jobs waiting across all printers"""
+        return sum(self.queue_depths().values())
+
+    def drain(self, timeout: float) -> bool:
+        """Wait for queued and running jobs on every printer to finish.
+
+        Returns False if jobs were still outstanding when ``timeout`` expired.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            if not worker.wait_idle(max(0.0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def _trim_history(self) -> None:
+        """Forget the oldest finished jobs; caller must hold the lock"""
+        excess = len(self._jobs) - self.max_history
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.is_finished()][:excess]:
+            del self._jobs[job_id]
@@ -1,246 +1,436 @@
 import os
+import time
 import tempfile
 import logging
 import platform
-from typing import List
-from PIL import Image, ImageWin
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from PIL import Image
+
+from config.button_mapping import DEVICE_DPI
+from printing.backends.base import CAP_BATCH_COPIES, PrinterBackend
+from printing.backends.mock import DEFAULT_MOCK_PRINTERS, MockBackend
+from printing.backends.registry import BackendRegistry, create_backends
+from printing.bitmap_cache import PreparedBitmapCache, PreparedLabel
+from printing.metrics import IMAGE_PREP_SECONDS, SPOOL_SECONDS, SVG_CONVERT_SECONDS
+from printing.print_jobs import PrintError
+from printing.monochrome import DITHER_METHODS, to_monochrome
+from printing.printer_registry import PrinterRegistry
+from printing.printer_session import PrinterSessionPool
+from printing.render_cache import RenderCache
+from printing.svg_rasterizers import ParsedSvgCache, SvgRasterizer, select_rasterizer
 
 
 class PrinterManager:
-    def __init__(self):
+    def __init__(self, render_cache_dir: str = "render_cache",
+                 render_cache_max_bytes: int = 64 * 1024 * 1024,
+                 printer_cache_ttl: float = 30.0,
+                 bitmap_cache_max_bytes: int = 128 * 1024 * 1024,
+                 backend: Optional[PrinterBackend] = None,
+                 backends: Optional[Sequence[str]] = None,
+                 printer_routes: Optional[Dict[str, str]] = None,
+                 printer_languages: Optional[Dict[str, str]] = None,
+                 printer_monochrome: Optional[Dict[str, str]] = None,
+                 svg_renderer: str = "auto",
+                 svg_debug_dir: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
         self.is_windows = platform.system() == "Windows"
 
+        # Rasterized SVG labels, keyed by content hash, engine, DPI and orientation
+        self.svg_render_dpi = 72
+        self.render_cache = RenderCache(render_cache_dir, render_cache_max_bytes)
+        # SVG engine ("auto" picks the fastest installed one on first use)
+        self.svg_renderer = svg_renderer
+        self.svg_rasterizer: Optional[SvgRasterizer] = None
+        self.parsed_svg_cache = ParsedSvgCache()
+        # Set to write every rendered SVG label to this directory and print from the file
+        self.svg_debug_dir = svg_debug_dir
+
+        # Labels rotated and scaled to device resolution, per printer and orientation
+        self.bitmap_cache = PreparedBitmapCache(bitmap_cache_max_bytes)
+        # Printers whose labels are reduced to 1 bit per pixel, with the dithering
+        # method for each; other printers (lasers, inkjets) get RGB
+        self.printer_monochrome = self._check_monochrome(printer_monochrome)
+
         # Mock printers for development
-        self.mock_printers = [
-            "DYMO LabelWriter 4XL",
-            "DYMO LabelWriter 450",
-            "DYMO LabelWriter 450 Turbo",
-            "DYMO LabelWriter 450 Duo",
-            "HP LaserJet Pro",
-            "Canon PIXMA"
-        ]
-
-        # Create mock print directory for development
+        self.mock_printers = list(DEFAULT_MOCK_PRINTERS)
         self.mock_print_dir = "mock_prints"
-        if not os.path.exists(self.mock_print_dir):
-            os.makedirs(self.mock_print_dir)
 
-    def get_available_printers(self) -> List[str]:
-        """Get list of available printer names"""
-        if self.is_windows:
-            try:
-                import win32print
-                printers = []
-                for printer_info in win32print.EnumPrinters(
-                    win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
-                ):
-                    printers.append(printer_info[2])  # printer_info[2] is the printer name
-                return printers
-            except Exception as e:
-                self.logger.error(f"Error enumerating printers: {e}")
-                return self.mock_printers
+        # How printers are reached: each printer is routed to one backend
+        # (Windows spooler, CUPS, raw commands, mock...), by default the cheapest
+        if backend is not None:
+            backend_list = [backend]
         else:
-            if not hasattr(self, '_mock_logged'):
-                self.logger.info("Using mock printers for macOS development")
-                self._mock_logged = True
-            return self.mock_printers
-
-    def is_printer_available(self, printer_name: str) -> bool:
-        """Check if a specific printer is available"""
-        available_printers = self.get_available_printers()
-        return printer_name in available_printers
-
-    def _convert_svg_to_png(self, svg_path: str) -> str:
-        """Convert SVG file to temporary PNG file using svglib + reportlab (no Cairo)."""
-        if not os.path.exists(svg_path):
-            raise FileNotFoundError(f"Image file not found: {svg_path}")
+            backend_list = create_backends(backends, self.mock_print_dir, self.mock_printers,
+                                           printer_languages)
+        self.printer_routes = dict(printer_routes or {})
+        self.backends = BackendRegistry(backend_list, self.printer_routes)
+
+        # Printer enumeration is cached and shared by the UI and the server
+        self.printer_registry = PrinterRegistry(self._enumerate_printers, printer_cache_ttl)
+
+        # Printer handles and device contexts stay open across jobs
+        self.session_pool = PrinterSessionPool(self.backends.open_session)
+        # A changed printer list usually means changed drivers or settings
+        self.printer_registry.subscribe(lambda printers: self.session_pool.invalidate())
+
+    def _enumerate_printers(self) -> List[str]:
+        """Ask every backend for printer names (slow; use the registry)"""
+        if not hasattr(self, '_mock_logged') and any(isinstance(b, MockBackend) for b in self.backends.backends):
+            self.logger.info("Using mock printers for macOS development")
+            self._mock_logged = True
+        routes = self.backends.routes()
+        printers = self.backends.enumerate_printers()
+        if self.backends.routes() != routes:
+            # A printer moved to another backend; its pooled session belongs to the old one
+            self.session_pool.invalidate()
+        return printers
+
+    def set_printer_routes(self, routes: Dict[str, str]) -> bool:
+        """Route printers to specific backends by name; other printers use the cheapest one.
+
+        Sessions and prepared labels are dropped only if the routes changed;
+        returns whether they did.
+        """
+        routes = dict(routes)
+        if routes == self.printer_routes:
+            return False
+        self.printer_routes = routes
+        self.backends.set_routes(routes)
+        self.session_pool.invalidate()
+        self.bitmap_cache.invalidate()
+        return True
+
+    @staticmethod
+    def _check_monochrome(methods: Optional[Dict[str, str]]) -> Dict[str, str]:
+        methods = {printer_name: method for printer_name, method in (methods or {}).items() if method}
+        for printer_name, method in methods.items():
+            if method not in DITHER_METHODS:
+                raise ValueError(f"Unknown dithering method '{method}' for {printer_name}. "
+                                 f"Available: {', '.join(DITHER_METHODS)}")
+        return methods
+
+    def set_printer_monochrome(self, methods: Optional[Dict[str, str]]) -> bool:
+        """Change which printers get 1-bit labels and how they are dithered.
+
+        Prepared labels are redone if the setting changed; returns whether it did.
+        """
+        methods = self._check_monochrome(methods)
+        if methods == self.printer_monochrome:
+            return False
+        self.printer_monochrome = methods
+        self.bitmap_cache.invalidate()
+        return True
 
+    def get_printer_backend(self, printer_name: str) -> Optional[PrinterBackend]:
+        """The backend a printer is routed to, or None if no backend reaches it"""
         try:
-            from svglib.svglib import svg2rlg
-            from reportlab.graphics import renderPM
-        except ImportError as e:
-            self.logger.error(f"svglib/reportlab missing: {e}")
-            raise ImportError(
-                "SVG support requires svglib and reportlab. Install: pip install svglib reportlab"
-            )
-
+            return self.backends.backend_for(printer_name)
+        except LookupError:
+            return None
+
+    def printer_status(self, printer_name: str) -> Optional[Dict]:
+        """Device or queue state from the printer's backend, if it can report one"""
+        backend = self.get_printer_backend(printer_name)
+        if backend is None:
+            return None
         try:
-            drawing = svg2rlg(svg_path)
-            if drawing is None:
-                raise ValueError("Failed to parse SVG (invalid or unsupported).")
+            return backend.printer_status(printer_name)
+        except Exception as e:
+            self.logger.warning(f"Could not query status of '{printer_name}': {e}")
+            return None
 
-            # Create temp PNG path
-            temp_fd, temp_path = tempfile.mkstemp(suffix=".png")
-            os.close(temp_fd)  # close the handle immediately (Windows lock avoidance)
+    def get_available_printers(self) -> List[str]:
+        """Get list of available printer names (cached)"""
+        return self.printer_registry.get_printers()
 
-            # Render to PNG (ReportLab uses Pillow internally; no Cairo)
-            # You can tweak dpi if you need crisper labels (e.g., dpi=300)
-            renderPM.drawToFile(drawing, temp_path, fmt="PNG")
+    def refresh_printers(self) -> List[str]:
+        """Re-enumerate printers now, bypassing the cache, and reopen printer sessions"""
+        self.session_pool.invalidate()
+        return self.printer_registry.refresh()
 
-            # Sanity check
-            if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
-                raise ValueError("PNG render produced an empty file.")
+    def is_printer_available(self, printer_name: str) -> bool:
+        """Check if a specific printer is available"""
+        return self.printer_registry.is_available(printer_name)
+
+    def _svg_rasterizer(self) -> SvgRasterizer:
+        """The SVG engine, chosen on first use (may time the installed engines)"""
+        if self.svg_rasterizer is None:
+            self.svg_rasterizer = select_rasterizer(self.svg_renderer)
+            self.logger.info(f"Rendering SVG labels with {self.svg_rasterizer.name}")
+        return self.svg_rasterizer
+
+    def _svg_cache_key(self, svg_path: str, orientation: str, dpi: Optional[float],
+                       target_area: Optional[Tuple[int, int]], engine: str) -> Tuple[str, str]:
+        """Return the source digest and the render cache key for an SVG render"""
+        digest = self.render_cache.source_digest(svg_path)
+        if dpi:
+            return digest, self.render_cache.make_key(digest, dpi, orientation, engine=engine)
+        if target_area:
+            return digest, self.render_cache.make_key(digest, 0, orientation, size=target_area, engine=engine)
+        return digest, self.render_cache.make_key(digest, self.svg_render_dpi, orientation, engine=engine)
+
+    def _render_svg(self, svg_path: str, orientation: str = "portrait",
+                    dpi: Optional[float] = None,
+                    target_area: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """Rasterize an SVG file into an in-memory image with the selected SVG engine.
+
+        With ``dpi`` the SVG is rendered at that resolution. Otherwise, given a
+        ``target_area`` in device pixels, it is rendered at the resolution that
+        makes it fill that area, so the bitmap reaches the printer 1:1 without
+        resampling; with neither, at ``svg_render_dpi``.
+
+        A render already in the on-disk render cache is decoded from there. New
+        renders go straight back to the caller; the render cache stores them in
+        the background, so printing never waits on PNG encoding or disk writes.
+        Parsed documents are kept in memory for renders at other sizes.
+        """
+        if not os.path.exists(svg_path):
+            raise FileNotFoundError(f"Image file not found: {svg_path}")
 
-            self.logger.info("✅ SVG converted using svglib+reportlab")
-            return temp_path
+        rasterizer = self._svg_rasterizer()
+        digest, cache_key = self._svg_cache_key(svg_path, orientation, dpi, target_area, rasterizer.name)
+        image = self.render_cache.load(cache_key)
+        if image is not None:
+            return image
 
+        started = time.perf_counter()
+        try:
+            document = self.parsed_svg_cache.get((digest, rasterizer.name))
+            if document is None:
+                document = rasterizer.load(svg_path)
+                self.parsed_svg_cache.put((digest, rasterizer.name), document)
+
+            if not dpi:
+                dpi = self._fit_dpi(rasterizer.size(document), orientation, target_area) \
+                    if target_area else self.svg_render_dpi
+
+            image = rasterizer.render(document, dpi)
+            if image.width == 0 or image.height == 0:
+                raise ValueError("Render produced an empty image.")
         except Exception as e:
             self.logger.error(f"SVG conversion failed: {e}")
             raise FileNotFoundError(f"Failed to convert SVG file '{svg_path}': {e}")
 
-    def _prepare_image_for_printing(self, image_path: str) -> str:
-        """Prepare image for printing, converting SVG if necessary"""
+        SVG_CONVERT_SECONDS.observe(time.perf_counter() - started)
+        self.logger.info(f"✅ SVG converted using {rasterizer.name}")
+        self.render_cache.store_async(cache_key, image)
+        return image
+
+    def _convert_svg_to_png(self, svg_path: str, orientation: str = "portrait",
+                            dpi: Optional[float] = None,
+                            target_area: Optional[Tuple[int, int]] = None) -> str:
+        """Render an SVG and write it to ``svg_debug_dir`` as a PNG; returns the file path.
+
+        Debug only: printing goes through the in-memory render unless
+        ``svg_debug_dir`` is set, in which case every rendered label is written
+        here and read back, so the exact bitmap sent to the printer can be inspected.
+        """
+        image = self._render_svg(svg_path, orientation, dpi, target_area)
+        os.makedirs(self.svg_debug_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(svg_path))[0]
+        path = os.path.join(self.svg_debug_dir, f"{name}_{orientation.lower()}_{image.width}x{image.height}.png")
+        image.save(path, "PNG")
+        return path
+
+    @staticmethod
+    def _fit_dpi(size: Tuple[float, float], orientation: str, target_area: Tuple[int, int]) -> float:
+        """Render DPI at which a drawing of ``size`` points just fits the target area"""
+        width, height = size
+        if orientation.lower() == "landscape":
+            # The render is rotated a quarter turn after rasterizing
+            width, height = height, width
+        return 72.0 * min(target_area[0] / width, target_area[1] / height)
+
+    def _load_svg_label(self, svg_path: str, orientation: str = "portrait",
+                        dpi: Optional[float] = None,
+                        target_area: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """Render an SVG label into an RGB image, rotated for landscape"""
+        try:
+            if self.svg_debug_dir:
+                return self._load_label_image(
+                    self._convert_svg_to_png(svg_path, orientation, dpi, target_area), orientation
+                )
+            return self._normalize_label_image(self._render_svg(svg_path, orientation, dpi, target_area),
+                                               orientation)
+        except ImportError as e:
+            self.logger.warning(f"SVG file detected but no SVG renderer is available ({e}). SVG support disabled.")
+            raise FileNotFoundError("SVG files are not supported without svglib and reportlab (or cairosvg)")
+
+    def _load_label_image(self, image_path: str, orientation: str = "portrait") -> Image.Image:
+        """Load a label file as an RGB image on a white background, rotated for landscape"""
+        with Image.open(image_path) as img:
+            img.load()
+            return self._normalize_label_image(img, orientation)
+
+    @staticmethod
+    def _normalize_label_image(img: Image.Image, orientation: str = "portrait") -> Image.Image:
+        """Return a label as a new RGB image on a white background, rotated for landscape"""
+        if img.mode in ('RGBA', 'LA'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        else:
+            img = img.copy()
+
+        # Rotate image if landscape
+        if orientation.lower() == "landscape":
+            img = img.rotate(-90, expand=True)  # rotate clockwise
+        return img
+
+    @staticmethod
+    def _fit_box(image_size, printable_area, upscale: bool = True) -> tuple:
+        """Scale an image to fit the printable area and center it on the page.
+
+        An image that already fits to within a pixel (a render made for this
+        area) keeps its size, so it is not resampled. With ``upscale`` off,
+        images smaller than the area keep their size too.
+        """
+        img_width, img_height = image_size
+        if printable_area is None:
+            return (0, 0, img_width, img_height)
+
+        scale = min(printable_area[0] / img_width, printable_area[1] / img_height)
+        if not upscale:
+            scale = min(scale, 1.0)
+        scaled_width = int(img_width * scale)
+        scaled_height = int(img_height * scale)
+        if abs(scaled_width - img_width) <= 1 and abs(scaled_height - img_height) <= 1 \
+                and img_width <= printable_area[0] and img_height <= printable_area[1]:
+            scaled_width, scaled_height = img_width, img_height
+
+        left = int((printable_area[0] - scaled_width) / 2)
+        top = int((printable_area[1] - scaled_height) / 2)
+        return (left, top, left + scaled_width, top + scaled_height)
+
+    def _render_dpi(self, printer_name: str, dpi: Optional[Union[float, str]]) -> Optional[float]:
+        """Resolve a mapping's DPI setting; "device" means the printer's own resolution"""
+        if dpi == DEVICE_DPI:
+            device_dpi = self.session_pool.device_dpi(printer_name)
+            return float(device_dpi[0]) if device_dpi else None
+        return float(dpi) if dpi else None
+
+    def prepare_label(self, image_path: str, printer_name: str, orientation: str = "portrait",
+                      dpi: Optional[Union[float, str]] = None) -> PreparedLabel:
+        """Return the label rotated and scaled to the printer's device resolution.
+
+        SVG labels are rendered straight at the size they will print at, taken
+        from the printer's printable area. With ``dpi`` (a number or "device")
+        an SVG is rendered at that resolution instead and printed at its own
+        size, only scaled down if it does not fit.
+
+        Results are cached per label, printer and orientation, so hot prints go
+        straight to the blit.
+        """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
 
+        printable_area = self.session_pool.printable_area(printer_name)
+        render_dpi = self._render_dpi(printer_name, dpi)
+        key = self.bitmap_cache.make_key(image_path, printer_name, orientation, printable_area, render_dpi)
+        prepared = self.bitmap_cache.get(key)
+        if prepared is not None:
+            return prepared
+
         if image_path.lower().endswith('.svg'):
-            try:
-                return self._convert_svg_to_png(image_path)
-            except ImportError:
-                self.logger.warning("SVG file detected but svglib/reportlab not available. SVG support disabled.")
-                raise FileNotFoundError("SVG files are not supported without svglib and reportlab libraries")
+            img = self._load_svg_label(image_path, orientation, render_dpi, printable_area)
+            started = time.perf_counter()
         else:
-            return image_path
-
-    def _direct_print_windows(self, image_path: str, printer_name: str, orientation: str = "portrait") -> bool:
-        """Direct silent printing for Windows (no dialog boxes)"""
+            started = time.perf_counter()
+            img = self._load_label_image(image_path, orientation)
+        box = self._fit_box(img.size, printable_area, upscale=render_dpi is None)
+        box_size = (box[2] - box[0], box[3] - box[1])
+        if img.size != box_size:
+            img = img.resize(box_size, Image.LANCZOS)
+        monochrome = self.printer_monochrome.get(printer_name)
+        if monochrome:
+            # Thermal heads print dots: dither once here instead of in the driver per copy
+            img = to_monochrome(img, monochrome)
+        IMAGE_PREP_SECONDS.observe(time.perf_counter() - started)
+
+        prepared = PreparedLabel(image_path, orientation, img, box)
+        self.bitmap_cache.put(key, prepared)
+        return prepared
+
+    def warm_labels(self, labels: Iterable[Tuple], printer_name: str) -> int:
+        """Prepare ``(image_path, orientation[, dpi])`` labels for a printer ahead of time.
+
+        Returns the number of labels prepared; failures are logged and skipped.
+        """
+        prepared = 0
+        for image_path, orientation, *dpi in labels:
+            try:
+                self.prepare_label(image_path, printer_name, orientation, *dpi)
+                prepared += 1
+            except Exception as e:
+                self.logger.warning(f"Could not prepare {image_path} for {printer_name}: {e}")
+        return prepared
+
+    def _print_via_session(self, prepared: PreparedLabel, printer_name: str, copies: int,
+                           doc_name: str) -> int:
+        """Print all copies of a prepared label through the pooled session"""
+        started = time.perf_counter()
+        with self.session_pool.session(printer_name) as session:
+            printed = session.print_prepared(prepared, copies, doc_name)
+        SPOOL_SECONDS.observe(time.perf_counter() - started)
+        return printed
+
+    def _print_prepared(self, prepared: PreparedLabel, printer_name: str, backend: PrinterBackend,
+                        copies: int = 1) -> int:
+        """Print a prepared label through its printer's backend, silently (no dialog boxes).
+
+        Backends with batch copies get every copy in a single document; others
+        get one document per copy. Returns the number of copies spooled; raises
+        PrintError, with the copies already spooled, if the backend fails.
+        """
+        doc_name = backend.document_name(prepared)
+        printed = 0
         try:
-            import win32print
-            import win32ui
-
-            # Open printer
-            hprinter = win32print.OpenPrinter(printer_name)
-            printer_dc = win32ui.CreateDC()
-            printer_dc.CreatePrinterDC(printer_name)
-
-            # Get printable area in pixels
-            HORZRES = printer_dc.GetDeviceCaps(8)
-            VERTRES = printer_dc.GetDeviceCaps(10)
-            printable_area = (HORZRES, VERTRES)
-
-            # Start document
-            printer_dc.StartDoc(image_path)
-            printer_dc.StartPage()
-
-            # Load and prep image
-            img = Image.open(image_path)
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Rotate image if landscape
-            if orientation.lower() == "landscape":
-                img = img.rotate(-90, expand=True)  # rotate clockwise
-
-            # Scale image to fit printable area
-            img_width, img_height = img.size
-            scale = min(printable_area[0] / img_width, printable_area[1] / img_height)
-            scaled_width = int(img_width * scale)
-            scaled_height = int(img_height * scale)
-
-            # Center on page
-            left = int((printable_area[0] - scaled_width) / 2)
-            top = int((printable_area[1] - scaled_height) / 2)
-            box = (left, top, left + scaled_width, top + scaled_height)
-
-            # Draw to printer DC
-            dib = ImageWin.Dib(img)
-            hdc = printer_dc.GetHandleOutput()
-
-            # Try stretch_draw first (newer Pillow)
-            if hasattr(dib, "stretch_draw"):
-                dib.stretch_draw(hdc, box)
+            if backend.has_capability(CAP_BATCH_COPIES):
+                printed = self._print_via_session(prepared, printer_name, copies, doc_name)
             else:
-                # Some Pillow versions only have draw(hdc, box)
-                try:
-                    dib.draw(hdc, box)
-                except TypeError:
-                    # Fallback if draw only accepts 1 arg
-                    dib.draw(hdc)
-
-            # Finish print job
-            printer_dc.EndPage()
-            printer_dc.EndDoc()
-            printer_dc.DeleteDC()
-            win32print.ClosePrinter(hprinter)
-
-            print(f"\n🖨️  SILENT PRINT SUCCESS!")
-            print(f"   📄 File: {os.path.basename(image_path)}")
-            print(f"   🖨️  Printer: {printer_name}")
-            print(f"   📐 Orientation: {orientation.title()}")
-            print(f"   ✅ Print job sent automatically.\n")
-            return True
-
+                for _ in range(copies):
+                    printed += self._print_via_session(prepared, printer_name, 1, doc_name)
         except Exception as e:
-            self.logger.error(f"Direct Windows print failed: {e}")
-            return False
-
-
-    def _mock_print(self, image_path: str, printer_name: str, orientation: str = "portrait") -> bool:
-        """Mock printing functionality for development"""
-        try:
-            import time
-            timestamp = int(time.time())
-            filename = os.path.basename(image_path)
-            name, ext = os.path.splitext(filename)
-            mock_filename = f"{name}_printed_{timestamp}_{orientation}{ext}"
-            mock_path = os.path.join(self.mock_print_dir, mock_filename)
-
-            with Image.open(image_path) as img:
-                if img.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'RGBA':
-                        background.paste(img, mask=img.split()[-1])
-                    else:
-                        background.paste(img)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Rotate image if landscape for mock printing
-                if orientation.lower() == "landscape":
-                    img = img.rotate(90, expand=True)
-
-                img.save(mock_path, 'PNG')
-
-            print(f"\n🎨 MOCK PRINT SUCCESS!")
-            print(f"   📄 File: {os.path.basename(image_path)}")
-            print(f"   🖨️  Printer: {printer_name}")
-            print(f"   📐 Orientation: {orientation.title()}")
-            print(f"   📁 Saved to: {mock_path}")
-            print(f"   📂 Mock prints directory: {os.path.abspath(self.mock_print_dir)}\n")
-
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Error in mock print: {e}")
-            return False
-
-    def print_image(self, image_path: str, printer_name: str, orientation: str = "portrait") -> bool:
-        """Print an image to the specified printer"""
+            raise PrintError(f"Print via {backend.name} failed: {e}", printed)
+
+        backend.report_printed(printer_name, prepared, printed)
+        return printed
+
+    def print_image_batch(self, image_path: str, printer_name: str, orientation: str = "portrait",
+                          copies: int = 1, dpi: Optional[Union[float, str]] = None) -> int:
+        """Print several copies of an image as a single job.
+
+        Availability is checked and the prepared bitmap is looked up once, then
+        every copy goes out in one spooler document. Returns the number of copies
+        printed. Failures raise, so callers can tell them apart: FileNotFoundError
+        for a missing or unreadable label, PrintError for an unavailable printer
+        or a spooler fault (with the number of copies printed before it).
+        """
+        if copies < 1:
+            return 0
         try:
             if not self.is_printer_available(printer_name):
-                self.logger.error(f"Printer '{printer_name}' is not available")
-                return False
-
-            print_path = self._prepare_image_for_printing(image_path)
+                raise PrintError(f"Printer '{printer_name}' is not available")
 
-            if self.is_windows:
-                success = self._direct_print_windows(print_path, printer_name, orientation)
-            else:
-                success = self._mock_print(print_path, printer_name, orientation)
-
-            # Clean up temporary file if it was a converted SVG
-            if print_path != image_path and os.path.exists(print_path):
-                try:
-                    os.unlink(print_path)
-                except Exception:
-                    pass
-
-            return success
+            prepared = self.prepare_label(image_path, printer_name, orientation, dpi)
+            backend = self.backends.backend_for(printer_name)
+            return self._print_prepared(prepared, printer_name, backend, copies)
 
         except Exception as e:
             self.logger.error(f"Error printing {image_path} to {printer_name}: {e}")
+            if isinstance(e, PrintError):
+                # The printer may have gone away; re-enumerate on the next lookup
+                self.printer_registry.invalidate()
+            raise
+
+    def print_image(self, image_path: str, printer_name: str, orientation: str = "portrait",
+                    dpi: Optional[Union[float, str]] = None) -> bool:
+        """Print an image to the specified printer"""
+        try:
+            return self.print_image_batch(image_path, printer_name, orientation, 1, dpi) == 1
+        except Exception:
             return False
 
     def test_print(self, printer_name: str) -> bool:
@@ -0,0 +1,81 @@
+import time
+import logging
+import threading
+from typing import Callable, List, Optional
+
+
+class PrinterRegistry:
+    """Cached list of installed printers.
+
+    Enumerating printers is a slow spooler call, so the list is cached for
+    ``ttl`` seconds. Callers can force a refresh, invalidate the cache after a
+    failed print, and subscribe to be told when the set of printers changes.
+    """
+
+    def __init__(self, enumerate_printers: Callable[[], List[str]], ttl: float = 30.0,
+                 miss_refresh_interval: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        # A lookup for an unknown printer re-enumerates at most this often
+        self.miss_refresh_interval = miss_refresh_interval
+
+        self._enumerate_printers = enumerate_printers
+        self._printers: List[str] = []
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._listeners: List[Callable[[List[str]], None]] = []
+
+    def _age(self) -> float:
+        if self._refreshed_at is None:
+            return float("inf")
+        return time.monotonic() - self._refreshed_at
+
+    def get_printers(self) -> List[str]:
+        """Return the cached printer list, re-enumerating only when it is stale"""
+        if self._age() > self.ttl:
+            return self.refresh()
+        with self._lock:
+            return list(self._printers)
+
+    def refresh(self) -> List[str]:
+        """Enumerate printers now and notify listeners if the list changed"""
+        with self._refresh_lock:
+            printers = list(self._enumerate_printers())
+            with self._lock:
+                changed = printers != self._printers
+                self._printers = printers
+                self._refreshed_at = time.monotonic()
+                listeners = list(self._listeners)
+
+        if changed:
+            self.logger.info(f"Printer list changed: {len(printers)} printers")
+            for listener in listeners:
+                try:
+                    listener(list(printers))
+                except Exception as e:
+                    self.logger.error(f"Printer change listener failed: {e}")
+        return list(printers)
+
+    def invalidate(self) -> None:
+        """Mark the cache stale so the next lookup re-enumerates"""
+        with self._lock:
+            self._refreshed_at = None
+
+    def is_available(self, printer_name: str) -> bool:
+        """Check a printer against the cache, re-enumerating once on a miss"""
+        if printer_name in self.get_printers():
+            return True
+        if self._age() > self.miss_refresh_interval:
+            return printer_name in self.refresh()
+        return False
+
+    def subscribe(self, listener: Callable[[List[str]], None]) -> None:
+        """Call ``listener(printers)`` whenever the printer list changes"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[List[str]], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from printing.bitmap_cache import PreparedLabel
+
+
+class PrinterSession:
+    """An open connection to one printer plus its cached device metrics.
+
+    Sessions are expensive to create (open handle, device context, capability
+    queries), so they are kept alive by PrinterSessionPool and reused across jobs.
+    """
+
+    def __init__(self, printer_name: str):
+        self.printer_name = printer_name
+        self.created_at = time.monotonic()
+        # Printable area in device pixels, or None if the device does not scale
+        self.printable_area: Optional[Tuple[int, int]] = None
+        self.dpi: Optional[Tuple[int, int]] = None
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        """Print ``copies`` pages of a prepared label as one document"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the handle and device context"""
+
+
+class Win32PrinterSession(PrinterSession):
+    """Printer handle and GDI device context for a Windows printer"""
+
+    # GetDeviceCaps indices
+    HORZRES = 8
+    VERTRES = 10
+    LOGPIXELSX = 88
+    LOGPIXELSY = 90
+
+    def __init__(self, printer_name: str):
+        super().__init__(printer_name)
+        import win32print
+        import win32ui
+
+        self._win32print = win32print
+        self.hprinter = win32print.OpenPrinter(printer_name)
+        try:
+            self.printer_dc = win32ui.CreateDC()
+            self.printer_dc.CreatePrinterDC(printer_name)
+        except Exception:
+            win32print.ClosePrinter(self.hprinter)
+            raise
+
+        # Get printable area in pixels
+        self.printable_area = (
+            self.printer_dc.GetDeviceCaps(self.HORZRES),
+            self.printer_dc.GetDeviceCaps(self.VERTRES),
+        )
+        self.dpi = (
+            self.printer_dc.GetDeviceCaps(self.LOGPIXELSX),
+            self.printer_dc.GetDeviceCaps(self.LOGPIXELSY),
+        )
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        dib = prepared.dib()
+        box = prepared.box
+        hdc = self.printer_dc.GetHandleOutput()
+
+        # Start document, one page per copy
+        self.printer_dc.StartDoc(doc_name)
+        try:
+            for _ in range(copies):
+                self.printer_dc.StartPage()
+
+                # Try stretch_draw first (newer Pillow)
+                if hasattr(dib, "stretch_draw"):
+                    dib.stretch_draw(hdc, box)
+                else:
+                    # Some Pillow versions only have draw(hdc, box)
+                    try:
+                        dib.draw(hdc, box)
+                    except TypeError:
+                        # Fallback if draw only accepts 1 arg
+                        dib.draw(hdc)
+
+                self.printer_dc.EndPage()
+        except Exception:
+            try:
+                self.printer_dc.AbortDoc()
+            except Exception:
+                pass
+            raise
+
+        # Finish print job
+        self.printer_dc.EndDoc()
+        return copies
+
+    def close(self) -> None:
+        try:
+            self.printer_dc.DeleteDC()
+        finally:
+            self._win32print.ClosePrinter(self.hprinter)
+
+
+# Sessions for different printers append to the same job log
+_job_log_lock = threading.Lock()
+
+
+class MockPrinterSession(PrinterSession):
+    """Development stand-in that records print jobs instead of printing.
+
+    Every document appends one JSON line to ``print_jobs.jsonl`` in the output
+    directory: printer, source, size, a hash of the rendered page and one
+    unique ID per copy. With ``store_images`` the rendered page is saved once
+    per distinct content as ``renders/<hash>.png``, so repeat prints cost one
+    log line and no image encoding.
+    """
+
+    JOB_LOG = "print_jobs.jsonl"
+    RENDERS_DIR = "renders"
+
+    def __init__(self, printer_name: str, output_dir: str, store_images: bool = True):
+        super().__init__(printer_name)
+        self.output_dir = output_dir
+        self.store_images = store_images
+        self.job_log_path = os.path.join(output_dir, self.JOB_LOG)
+        self.renders_dir = os.path.join(output_dir, self.RENDERS_DIR)
+        self.documents = 0
+        self.pages = 0
+        self.closed = False
+        self.last_record: Optional[Dict] = None
+        self._stored_hashes = set()
+        self._job_log = open(self.job_log_path, 'a')
+
+    def _store_render(self, prepared: PreparedLabel, content_hash: str) -> str:
+        """Save the page image once per distinct content; returns its path"""
+        path = os.path.join(self.renders_dir, f"{content_hash}.png")
+        if content_hash not in self._stored_hashes:
+            if not os.path.exists(path):
+                os.makedirs(self.renders_dir, exist_ok=True)
+                temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                prepared.image.save(temp_path, 'PNG')
+                os.replace(temp_path, path)
+            self._stored_hashes.add(content_hash)
+        return path
+
+    def print_prepared(self, prepared: PreparedLabel, copies: int, doc_name: str) -> int:
+        content_hash = prepared.content_hash()
+        render_path = self._store_render(prepared, content_hash) if self.store_images else None
+
+        job_id = uuid.uuid4().hex
+        record = {
+            "job_id": job_id,
+            "time": time.time(),
+            "printer": self.printer_name,
+            "document": doc_name,
+            "source": prepared.source_path,
+            "orientation": prepared.orientation,
+            "size": list(prepared.image.size),
+            "box": list(prepared.box),
+            "content_hash": content_hash,
+            "render": os.path.relpath(render_path, self.output_dir) if render_path else None,
+            "copies": copies,
+            "copy_ids": [f"{job_id}-{copy_index + 1}" for copy_index in range(copies)],
+        }
+        line = json.dumps(record) + "\n"
+        with _job_log_lock:
+            self._job_log.write(line)
+            self._job_log.flush()
+
+        self.last_record = record
+        self.documents += 1
+        self.pages += copies
+        return copies
+
+    def close(self) -> None:
+        self.closed = True
+        self._job_log.close()
+
+
+class PrinterSessionPool:
+    """Keeps one open session per printer and hands it out to print jobs.
+
+    A session is rebuilt when printing through it raises, when it is older than
+    ``max_age`` seconds (so driver setting changes are picked up), or after
+    invalidate() is called. Use of a session is serialized per printer.
+
+    Device metrics (printable area and DPI) are recorded when a session opens
+    and read without borrowing it, so preparing labels never waits for a job
+    that is spooling on the same printer.
+    """
+
+    def __init__(self, session_factory: Callable[[str], PrinterSession], max_age: float = 600.0):
+        self.logger = logging.getLogger(__name__)
+        self.max_age = max_age
+        self._session_factory = session_factory
+        self._sessions: Dict[str, PrinterSession] = {}
+        self._printer_locks: Dict[str, threading.Lock] = {}
+        # printer -> (printable_area, dpi) of its latest session
+        self._metrics: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]] = {}
+        self._lock = threading.Lock()
+
+    def _printer_lock(self, printer_name: str) -> threading.Lock:
+        with self._lock:
+            lock = self._printer_locks.get(printer_name)
+            if lock is None:
+                lock = self._printer_locks[printer_name] = threading.Lock()
+            return lock
+
+    def _close(self, session: PrinterSession) -> None:
+        try:
+            session.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing session for '{session.printer_name}': {e}")
+
+    @contextmanager
+    def session(self, printer_name: str) -> Iterator[PrinterSession]:
+        """Borrow the printer's session, creating or recreating it as needed"""
+        with self._printer_lock(printer_name):
+            with self._lock:
+                session = self._sessions.get(printer_name)
+            if session is not None and time.monotonic() - session.created_at > self.max_age:
+                self._discard(printer_name, session)
+                session = None
+            if session is None:
+                session = self._session_factory(printer_name)
+                with self._lock:
+                    self._sessions[printer_name] = session
+                    self._metrics[printer_name] = (session.printable_area, session.dpi)
+                self.logger.debug(f"Opened printer session for '{printer_name}'")
+
+            try:
+                yield session
+            except Exception:
+                # The handle or DC may be broken; start fresh next time
+                self._discard(printer_name, session)
+                raise
+
+    def _device_metrics(self, printer_name: str) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        with self._lock:
+            metrics = self._metrics.get(printer_name)
+        if metrics is None:
+            # First use of this printer: open its session to query the device
+            with self.session(printer_name) as session:
+                metrics = (session.printable_area, session.dpi)
+        return metrics
+
+    def printable_area(self, printer_name: str) -> Optional[Tuple[int, int]]:
+        """Printable area of a printer in device pixels, as reported by its session"""
+        return self._device_metrics(printer_name)[0]
+
+    def device_dpi(self, printer_name: str) -> Optional[Tuple[int, int]]:
+        """Resolution of a printer in dots per inch, as reported by its session"""
+        return self._device_metrics(printer_name)[1]
+
+    def _discard(self, printer_name: str, session: PrinterSession) -> None:
+        with self._lock:
+            if self._sessions.get(printer_name) is session:
+                del self._sessions[printer_name]
+        self._close(session)
+
+    def invalidate(self, printer_name: Optional[str] = None) -> None:
+        """Close one printer's session (or all) so the next job reopens it"""
+        with self._lock:
+            names = [printer_name] if printer_name else list(self._sessions)
+        for name in names:
+            with self._printer_lock(name):
+                with self._lock:
+                    session = self._sessions.pop(name, None)
+                    # Driver settings may have changed; query the device again
+                    self._metrics.pop(name, None)
+                if session is not None:
+                    self._close(session)
+
+    def close_all(self) -> None:
+        """Close every pooled session"""
+        self.invalidate()
+
+    def open_printers(self) -> List[str]:
+        """Names of printers with an open session"""
+        with self._lock:
+            return list(self._sessions)
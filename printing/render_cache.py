@@ -0,0 +1,217 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+from PIL import Image
+
+
+class RenderCache:
+    """Persistent on-disk cache of rasterized SVG labels.
+
+    Entries are keyed by the SHA-256 of the SVG source plus the render DPI and
+    orientation, so an edited label simply misses and gets rendered again.
+    The least recently used PNGs are evicted once the cache exceeds its size cap.
+    New renders are written by a background thread (``store_async``), so the
+    caller can print the in-memory image without waiting for the PNG encoder.
+    """
+
+    def __init__(self, cache_dir: str = "render_cache", max_bytes: int = 64 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size in bytes
+        self._total_bytes = 0
+        # path -> (mtime_ns, size, digest) so unchanged files are not re-hashed
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        # Keys queued for writing, so a label printed twice is only written once
+        self._pending: Set[str] = set()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render-cache-writer")
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from the files already on disk (oldest access first)"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(".tmp-"):
+                # Never an entry. Another process's file was left by an interrupted
+                # write; this process's may belong to another cache still writing it.
+                if not name.endswith(f"-{os.getpid()}.png"):
+                    try:
+                        os.unlink(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+                continue
+            if not name.endswith(".png"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            files.append((st.st_mtime, name[:-4], st.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def source_digest(self, source_path: str) -> str:
+        """Return the content hash of a source file, re-hashing only when it changed"""
+        st = os.stat(source_path)
+        abs_path = os.path.abspath(source_path)
+        with self._lock:
+            known = self._digests.get(abs_path)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return known[2]
+
+        h = hashlib.sha256()
+        with open(source_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+        with self._lock:
+            self._digests[abs_path] = (st.st_mtime_ns, st.st_size, digest)
+            if known and known[2] != digest:
+                # Source changed: drop every render of the previous version
+                for key in [k for k in self._entries if k.startswith(known[2])]:
+                    self._remove(key)
+        return digest
+
+    @staticmethod
+    def make_key(digest: str, dpi: float, orientation: str, size: Optional[Tuple[int, int]] = None,
+                 engine: str = "") -> str:
+        """Build a cache key from the source digest and render parameters.
+
+        ``size`` is used for renders fitted to a target area instead of a fixed
+        DPI; ``engine`` names the SVG renderer, since engines differ slightly.
+        """
+        prefix = f"{digest}_{engine}" if engine else digest
+        if size:
+            return f"{prefix}_fit{size[0]}x{size[1]}_{orientation.lower()}"
+        return f"{prefix}_{dpi:g}dpi_{orientation.lower()}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached PNG path for a key, or None on a miss"""
+        path = self._entry_path(key)
+        with self._lock:
+            if key not in self._entries or not os.path.exists(path):
+                if key in self._entries:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)  # persist LRU order across restarts
+        except OSError:
+            pass
+        return path
+
+    def load(self, key: str) -> Optional[Image.Image]:
+        """Return the cached render for a key as a decoded image, or None on a miss"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image
+        except OSError as e:
+            self.logger.warning(f"Dropping unreadable render cache entry {key}: {e}")
+            with self._lock:
+                self._remove(key)
+            return None
+
+    def store_async(self, key: str, image: Image.Image) -> None:
+        """Queue an in-memory render to be written to the cache in the background"""
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._writer.submit(self._store, key, image)
+
+    def _store(self, key: str, image: Image.Image) -> None:
+        temp_path = self.new_temp_path()
+        try:
+            image.save(temp_path, "PNG")
+            self.put(key, temp_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to write render cache entry {key}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def flush(self) -> None:
+        """Wait until every queued render has been written"""
+        self._writer.submit(lambda: None).result()
+
+    def put(self, key: str, png_path: str) -> str:
+        """Move a freshly rendered PNG into the cache and return its cached path"""
+        path = self._entry_path(key)
+        os.replace(png_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]
+            self._entries[key] = size
+            self._entries.move_to_end(key)
+            self._total_bytes += size
+            self._evict(keep=key)
+        return path
+
+    def new_temp_path(self) -> str:
+        """Return a path inside the cache directory for rendering a new entry"""
+        return os.path.join(self.cache_dir, f".tmp-{threading.get_ident()}-{os.getpid()}.png")
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry; caller must hold the lock"""
+        size = self._entries.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            os.unlink(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used entries until the cache fits its size cap"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._remove(key)
+            self.logger.debug(f"Evicted render cache entry {key}")
+
+    def clear(self) -> None:
+        """Remove every cached render"""
+        self.flush()
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
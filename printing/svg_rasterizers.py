@@ -0,0 +1,251 @@
+import io
+import os
+import re
+import time
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type
+from xml.etree import ElementTree
+from PIL import Image
+
+# Points per unit for SVG lengths (CSS pixels are 1/96 inch)
+_UNIT_POINTS = {"": 0.75, "px": 0.75, "pt": 1.0, "pc": 12.0, "in": 72.0,
+                "mm": 72.0 / 25.4, "cm": 72.0 / 2.54}
+_LENGTH = re.compile(r"^\s*([0-9.eE+-]+)\s*([a-z]*)\s*$")
+
+# Small label used to time the engines against each other
+_SAMPLE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="400" height="200" viewBox="0 0 400 200">'
+    '<rect x="4" y="4" width="392" height="192" fill="white" stroke="black" stroke-width="3"/>'
+    + "".join(f'<text x="20" y="{40 + i * 30}" font-size="20" font-family="Helvetica">'
+              f'PART-{i:04d} Lot 2024-{i}</text>' for i in range(4))
+    + "".join(f'<rect x="{x}" y="150" width="2" height="40" fill="black"/>' for x in range(20, 380, 5))
+    + "</svg>"
+)
+
+
+def svg_size_points(data: bytes) -> Tuple[float, float]:
+    """Width and height of an SVG document in points, from its root element"""
+    root = ElementTree.fromstring(data)
+    view_box = (root.get("viewBox") or "").replace(",", " ").split()
+
+    def length(attribute: str, index: int) -> float:
+        match = _LENGTH.match(root.get(attribute) or "")
+        if match and match.group(2) in _UNIT_POINTS:
+            return float(match.group(1)) * _UNIT_POINTS[match.group(2)]
+        if len(view_box) == 4:
+            return float(view_box[index]) * _UNIT_POINTS["px"]
+        raise ValueError(f"SVG has no usable {attribute}")
+
+    return length("width", 2), length("height", 3)
+
+
+class SvgRasterizer:
+    """An SVG rendering engine.
+
+    Parsing and rendering are separate steps so a parsed document can be kept
+    and rendered again at another size. Sizes are in points (1/72 inch), and
+    ``render`` returns an image of ``size * dpi / 72`` pixels.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the engine's libraries are installed"""
+        raise NotImplementedError
+
+    def load(self, svg_path: str) -> Any:
+        """Parse an SVG file; raises ValueError if it cannot be parsed"""
+        raise NotImplementedError
+
+    def size(self, document: Any) -> Tuple[float, float]:
+        raise NotImplementedError
+
+    def render(self, document: Any, dpi: float) -> Image.Image:
+        raise NotImplementedError
+
+
+class ReportlabRasterizer(SvgRasterizer):
+    """svglib + reportlab renderPM: pure Python plus reportlab's C extension, no Cairo"""
+
+    name = "reportlab"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import svglib.svglib  # noqa: F401
+            import reportlab.graphics.renderPM  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def load(self, svg_path: str) -> Any:
+        from svglib.svglib import svg2rlg
+        drawing = svg2rlg(svg_path)
+        if drawing is None:
+            raise ValueError("Failed to parse SVG (invalid or unsupported).")
+        return drawing
+
+    def size(self, document: Any) -> Tuple[float, float]:
+        return document.width, document.height
+
+    def render(self, document: Any, dpi: float) -> Image.Image:
+        from reportlab.graphics import renderPM
+        return renderPM.drawToPIL(document, dpi=dpi)
+
+
+class CairoSvgRasterizer(SvgRasterizer):
+    """CairoSVG: renders with the native Cairo library, usually much faster on complex labels"""
+
+    name = "cairosvg"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import cairosvg  # noqa: F401  (also fails when the Cairo library is missing)
+        except (ImportError, OSError):
+            return False
+        return True
+
+    def load(self, svg_path: str) -> Any:
+        with open(svg_path, "rb") as f:
+            data = f.read()
+        try:
+            size = svg_size_points(data)
+        except ElementTree.ParseError as e:
+            raise ValueError(f"Failed to parse SVG: {e}")
+        return data, size
+
+    def size(self, document: Any) -> Tuple[float, float]:
+        return document[1]
+
+    def render(self, document: Any, dpi: float) -> Image.Image:
+        import cairosvg
+        # CairoSVG maps CSS pixels 1:1 at 96 DPI; scale them to the target resolution
+        png = cairosvg.svg2png(bytestring=document[0], dpi=96, scale=dpi / 96.0,
+                               background_color="white")
+        with Image.open(io.BytesIO(png)) as image:
+            return image.convert("RGB")
+
+
+RASTERIZERS: Dict[str, Type[SvgRasterizer]] = {
+    ReportlabRasterizer.name: ReportlabRasterizer,
+    CairoSvgRasterizer.name: CairoSvgRasterizer,
+}
+
+
+def available_rasterizers() -> List[str]:
+    """Names of SVG engines that can be used in this environment"""
+    return [name for name, rasterizer in RASTERIZERS.items() if rasterizer.is_available()]
+
+
+def time_rasterizer(rasterizer: SvgRasterizer, svg_path: str, dpi: float = 300, runs: int = 2) -> float:
+    """Best time in seconds to parse and render an SVG file"""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        rasterizer.render(rasterizer.load(svg_path), dpi)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+_selected: Dict[str, SvgRasterizer] = {}
+_select_lock = threading.Lock()
+
+
+def select_rasterizer(name: str = "auto") -> SvgRasterizer:
+    """Return the SVG engine to use, created once per process.
+
+    ``auto`` picks the only installed engine, or, with several, the one that
+    renders a sample label fastest; engines that fail on the sample are skipped.
+    A named engine must be installed.
+    """
+    with _select_lock:
+        rasterizer = _selected.get(name)
+        if rasterizer is not None:
+            return rasterizer
+
+        if name != "auto":
+            rasterizer_class = RASTERIZERS.get(name)
+            if rasterizer_class is None:
+                raise ValueError(f"Unknown SVG renderer '{name}'. Available: {', '.join(RASTERIZERS)}")
+            if not rasterizer_class.is_available():
+                raise ImportError(f"SVG renderer '{name}' is not installed")
+            rasterizer = rasterizer_class()
+        else:
+            rasterizer = _fastest([RASTERIZERS[n]() for n in available_rasterizers()])
+        _selected[name] = rasterizer
+        return rasterizer
+
+
+def _fastest(candidates: List[SvgRasterizer]) -> SvgRasterizer:
+    if not candidates:
+        raise ImportError(
+            "SVG support requires svglib and reportlab (or cairosvg). Install: pip install svglib reportlab"
+        )
+    if len(candidates) == 1:
+        return candidates[0]
+
+    fd, sample_path = tempfile.mkstemp(suffix=".svg")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(_SAMPLE_SVG)
+        timings = {}
+        for rasterizer in candidates:
+            try:
+                timings[rasterizer.name] = time_rasterizer(rasterizer, sample_path)
+            except Exception as e:
+                rasterizer.logger.warning(f"SVG renderer {rasterizer.name} failed on the sample label: {e}")
+    finally:
+        os.unlink(sample_path)
+
+    if not timings:
+        raise ImportError("No SVG renderer could render the sample label")
+    fastest = min(timings, key=timings.get)
+    logging.getLogger(__name__).info(
+        "SVG renderer timings: " + ", ".join(f"{n} {t * 1000:.1f} ms" for n, t in timings.items())
+        + f"; using {fastest}"
+    )
+    return next(rasterizer for rasterizer in candidates if rasterizer.name == fastest)
+
+
+class ParsedSvgCache:
+    """Small in-process LRU of parsed SVG documents.
+
+    Keyed by source digest and engine, so rendering the same label for another
+    printer, orientation or DPI skips parsing.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            document = self._entries.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def put(self, key: Hashable, document: Any) -> None:
+        with self._lock:
+            self._entries[key] = document
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,8 +1,19 @@
+import os
 import logging
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from typing import Dict, Optional
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from printing.metrics import MAPPING_LOOKUP_SECONDS, PRINT_REQUESTS, REGISTRY, CallbackMetric, cache_metrics
+from printing.print_jobs import PrintJob
+from printing.print_scheduler import PrintScheduler, SchedulerFullError
+from server.serving import create_backend
+
+# Safety caps for print requests
+MAX_QUANTITY = 50
+MAX_BATCH_ITEMS = 50
 
 class FlaskPrintServer:
     def __init__(self, config_manager, printer_manager):
@@ -10,11 +21,32 @@ class FlaskPrintServer:
         self.printer_manager = printer_manager
         self.app = Flask(__name__)
         self.server_thread = None
+        self.backend = None
+        self.host = None
+        self.port = None
         self.is_running = False
         self.logger = logging.getLogger(__name__)
         
+        # Print jobs are acknowledged immediately and printed by one worker per printer
+        self.scheduler = PrintScheduler(printer_manager)
+        
+        # Result of the last label warm-up pass (see warm_up)
+        self.warmup_report = {'state': 'not_run', 'labels': {}}
+        
         # Setup routes
         self._setup_routes()
+        self._register_metrics()
+    
+    def _register_metrics(self):
+        """Expose queue depths and cache counters, read when /metrics is scraped"""
+        REGISTRY.register(CallbackMetric(
+            "label_print_queue_depth", "Jobs waiting per printer",
+            lambda: {(name,): depth for name, depth in self.scheduler.queue_depths().items()},
+            ("printer",)
+        ))
+        for metric in cache_metrics([("svg_render", self.printer_manager.render_cache),
+                                     ("prepared_bitmap", self.printer_manager.bitmap_cache)]):
+            REGISTRY.register(metric)
     
     def _setup_routes(self):
         """Setup Flask routes"""
@@ -25,34 +57,131 @@ class FlaskPrintServer:
             return jsonify({
                 'message': 'Label Printer Automation API',
                 'version': '1.0.0',
-                'endpoints': ['/print/<button_id>', '/status', '/health']
+                'endpoints': ['/print/<button_id>', '/print/batch', '/jobs/<job_id>', '/status',
+                              '/metrics', '/health']
             })
         
+        @self.app.route('/print/batch', methods=['POST'])
+        def print_batch():
+            """Queue labels for several buttons in one request.
+            
+            The body is a JSON list of ``{"button_id": ..., "quantity": N}`` items
+            (or ``{"items": [...]}``). Every item is validated before anything is
+            queued; the jobs are then queued as one group, or not at all.
+            """
+            try:
+                # Accept the JSON body whatever Content-Type the client sent
+                body = request.get_json(force=True, silent=True)
+                items = body.get('items') if isinstance(body, dict) else body
+                if not isinstance(items, list) or not items:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Expected a JSON list of {"button_id": ..., "quantity": N} items'
+                    }), 400
+                if len(items) > MAX_BATCH_ITEMS:
+                    return jsonify({
+                        'success': False,
+                        'error': f'Too many items in batch (max {MAX_BATCH_ITEMS})'
+                    }), 400
+                
+                config = self.config_manager.snapshot()
+                selected_printer = config.get("selected_printer", "")
+                if not selected_printer:
+                    self.logger.error("No printer selected")
+                    return jsonify({
+                        'success': False,
+                        'error': 'No printer selected'
+                    }), 500
+                
+                results = []
+                jobs = []
+                for index, item in enumerate(items):
+                    result = {'index': index}
+                    results.append(result)
+                    if not isinstance(item, dict):
+                        result['error'] = 'Item must be an object'
+                        continue
+                    button_id = str(item.get('button_id', ''))
+                    result['button_id'] = button_id
+                    mapping = config.mappings.get(button_id)
+                    if mapping is None:
+                        result['error'] = f'Button ID "{button_id}" not configured'
+                        continue
+                    if not os.path.exists(mapping.file):
+                        result['error'] = f'Label file for button "{button_id}" not found: {mapping.file}'
+                        continue
+                    quantity = item.get('quantity', 1)
+                    if isinstance(quantity, bool) or not isinstance(quantity, (int, str)) \
+                            or not str(quantity).strip().isdigit() or int(quantity) < 1:
+                        result['error'] = 'Quantity must be a positive integer'
+                        continue
+                    quantity = min(int(quantity), MAX_QUANTITY)
+                    jobs.append(PrintJob(button_id, mapping.file, selected_printer, mapping.orientation, quantity,
+                                         mapping.dpi))
+                
+                if len(jobs) != len(items):
+                    self.logger.warning(f"Rejected print batch of {len(items)} items: validation failed")
+                    return jsonify({
+                        'success': False,
+                        'error': 'Batch rejected; nothing was queued',
+                        'items': results
+                    }), 400
+                
+                try:
+                    group_id = self.scheduler.submit_group(jobs)
+                except SchedulerFullError as e:
+                    self.logger.warning(f"Rejected print batch of {len(jobs)} items: {e}")
+                    return jsonify({
+                        'success': False,
+                        'error': str(e)
+                    }), 503, {'Retry-After': '1'}
+                
+                for result, job in zip(results, jobs):
+                    result.update({
+                        'job_id': job.id,
+                        'status': job.status,
+                        'status_url': f'/jobs/{job.id}',
+                        'label_file': job.label_file,
+                        'orientation': job.orientation,
+                        'requested_quantity': job.quantity
+                    })
+                return jsonify({
+                    'success': True,
+                    'message': f'Queued {len(jobs)} print jobs',
+                    'group_id': group_id,
+                    'printer': selected_printer,
+                    'items': results
+                }), 202
+                
+            except Exception as e:
+                self.logger.error(f"Error processing print batch: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': f'Internal server error: {str(e)}'
+                }), 500
+        
         @self.app.route('/print/<button_id>', methods=['GET', 'POST'])
         def print_label(button_id):
             """Print label for given button ID"""
             try:
-                # Get button mappings
-                button_mappings = self.config_manager.get_button_mappings()
+                started = time.perf_counter()
+                # One snapshot, so the mapping and printer come from the same config version
+                config = self.config_manager.snapshot()
+                # Normalized mapping, resolved when the config was loaded
+                mapping = config.mappings.get(button_id)
+                MAPPING_LOOKUP_SECONDS.observe(time.perf_counter() - started)
                 
-                if button_id not in button_mappings:
+                if mapping is None:
                     self.logger.warning(f"Button ID '{button_id}' not found in mappings")
                     return jsonify({
                         'success': False,
                         'error': f'Button ID "{button_id}" not configured'
                     }), 404
                 
-                # Get mapping data (handle both old and new format)
-                mapping_data = button_mappings[button_id]
-                if isinstance(mapping_data, dict):
-                    label_file = mapping_data.get("file", "")
-                    orientation = mapping_data.get("orientation", "portrait")
-                else:
-                    # Backward compatibility with old format
-                    label_file = mapping_data
-                    orientation = "portrait"
+                label_file = mapping.file
+                orientation = mapping.orientation
                 
-                selected_printer = self.config_manager.get_selected_printer()
+                selected_printer = config.get("selected_printer", "")
                 
                 if not selected_printer:
                     self.logger.error("No printer selected")
@@ -69,40 +198,31 @@ class FlaskPrintServer:
                     quantity = 1
                 if quantity < 1:
                     quantity = 1
-                if quantity > 50:
-                    quantity = 50  # simple safety cap
+                if quantity > MAX_QUANTITY:
+                    quantity = MAX_QUANTITY  # simple safety cap
 
-                # Print requested quantity
-                successes = 0
-                failures = 0
-                for _ in range(quantity):
-                    if self.printer_manager.print_image(label_file, selected_printer, orientation):
-                        successes += 1
-                    else:
-                        failures += 1
-
-                if failures == 0:
-                    self.logger.info(f"Printed {successes}/{quantity} for button {button_id}: {label_file} ({orientation})")
-                    return jsonify({
-                        'success': True,
-                        'message': f'Print jobs sent for button {button_id}',
-                        'label_file': label_file,
-                        'printer': selected_printer,
-                        'orientation': orientation,
-                        'requested_quantity': quantity,
-                        'printed': successes
-                    })
-                else:
-                    self.logger.error(f"Partial/failed prints {successes}/{quantity} for button {button_id}: {label_file}")
+                # Queue the job and acknowledge right away; the printer's worker prints it
+                try:
+                    job = self.scheduler.submit(
+                        PrintJob(button_id, label_file, selected_printer, orientation, quantity, mapping.dpi)
+                    )
+                except SchedulerFullError as e:
+                    self.logger.warning(f"Rejected print for button {button_id}: {e}")
                     return jsonify({
                         'success': False,
-                        'error': f'Printed {successes} of {quantity} requested',
-                        'label_file': label_file,
-                        'printer': selected_printer,
-                        'orientation': orientation,
-                        'requested_quantity': quantity,
-                        'printed': successes
-                    }), 500
+                        'error': str(e)
+                    }), 503, {'Retry-After': '1'}
+                return jsonify({
+                    'success': True,
+                    'message': f'Print job queued for button {button_id}',
+                    'job_id': job.id,
+                    'status': job.status,
+                    'status_url': f'/jobs/{job.id}',
+                    'label_file': label_file,
+                    'printer': selected_printer,
+                    'orientation': orientation,
+                    'requested_quantity': quantity
+                }), 202
                     
             except Exception as e:
                 self.logger.error(f"Error processing print request for button {button_id}: {e}")
@@ -111,51 +231,177 @@ class FlaskPrintServer:
                     'error': f'Internal server error: {str(e)}'
                 }), 500
         
+        @self.app.route('/jobs/<job_id>', methods=['GET'])
+        def get_job(job_id):
+            """Get the state of a queued print job"""
+            job = self.scheduler.get_job(job_id)
+            if job is None:
+                return jsonify({
+                    'success': False,
+                    'error': f'Job "{job_id}" not found'
+                }), 404
+            return jsonify({'success': True, 'job': job.to_dict()})
+        
         @self.app.route('/status', methods=['GET'])
         def get_status():
             """Get server status"""
+            config = self.config_manager.snapshot()
+            printer_name = config.get("selected_printer", "")
+            backend = self.printer_manager.get_printer_backend(printer_name) if printer_name else None
             return jsonify({
                 'success': True,
                 'status': 'running',
-                'printer': self.config_manager.get_selected_printer(),
-                'button_count': len(self.config_manager.get_button_mappings())
+                'printer': printer_name,
+                'printer_backend': backend.name if backend else None,
+                'printer_status': self.printer_manager.printer_status(printer_name) if backend else None,
+                'button_count': len(config.mappings),
+                'pending_jobs': self.scheduler.pending_count(),
+                'queue_depths': self.scheduler.queue_depths(),
+                'warm_up': self.warmup_report
             })
         
+        @self.app.route('/metrics', methods=['GET'])
+        def metrics():
+            """Pipeline latency, throughput, queue and cache metrics in Prometheus text format"""
+            return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+        
+        @self.app.after_request
+        def count_print_requests(response):
+            if request.endpoint in ('print_label', 'print_batch'):
+                PRINT_REQUESTS.labels(request.endpoint, str(response.status_code)).inc()
+            return response
+        
         @self.app.route('/health', methods=['GET'])
         def health_check():
             """Health check endpoint"""
             return jsonify({'status': 'healthy'})
     
-    def start_server(self, host: str = "0.0.0.0", port: int = 5000):
+    def warm_up(self, max_workers: int = 4) -> Dict:
+        """Pre-render every mapped label for the selected printer.
+
+        Labels are prepared in parallel so the first press of each button is as
+        fast as any later one. Per-label timing and errors are kept in
+        ``warmup_report``, which is also exposed on /status.
+        """
+        config = self.config_manager.snapshot()
+        printer_name = config.get("selected_printer", "")
+        mappings = config.mappings
+        report = {'state': 'running', 'printer': printer_name, 'started_at': time.time(), 'labels': {}}
+        self.warmup_report = report
+        
+        if not printer_name:
+            report['state'] = 'skipped'
+            report['error'] = 'No printer selected'
+            return report
+        
+        def warm_label(button_id, mapping):
+            label_file = mapping.file
+            orientation = mapping.orientation
+            result = {'file': label_file, 'orientation': orientation, 'ok': False}
+            start = time.perf_counter()
+            try:
+                self.printer_manager.prepare_label(label_file, printer_name, orientation, mapping.dpi)
+                result['ok'] = True
+            except Exception as e:
+                result['error'] = str(e)
+                self.logger.warning(f"Warm-up failed for button {button_id} ({label_file}): {e}")
+            result['seconds'] = round(time.perf_counter() - start, 4)
+            report['labels'][button_id] = result
+        
+        start = time.perf_counter()
+        if mappings:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warm-up") as executor:
+                for button_id, mapping in mappings.items():
+                    executor.submit(warm_label, button_id, mapping)
+        
+        failed = sum(1 for r in report['labels'].values() if not r['ok'])
+        report['seconds'] = round(time.perf_counter() - start, 4)
+        report['failed'] = failed
+        report['state'] = 'done'
+        self.logger.info(f"Warm-up prepared {len(mappings) - failed}/{len(mappings)} "
+                         f"labels in {report['seconds']:.2f}s")
+        return report
+    
+    def start_server(self, host: str = "0.0.0.0", port: int = 5000, warm_up: Optional[bool] = None):
         """Start Flask server in background thread"""
         if self.is_running:
             self.logger.warning("Server is already running")
             return
         
+        backend_name = self.config_manager.get("server_backend", "auto")
+        threads = self.config_manager.get("server_threads", 8)
+        keep_alive = self.config_manager.get("server_keep_alive", 5)
+        
+        # Binding happens here, so a busy port is reported to the caller
+        backend = create_backend(backend_name, self.app, host, port, threads, keep_alive)
+        self.backend = backend
+        self.host = host
+        self.port = port
+        
         def run_server():
             try:
-                self.logger.info(f"Starting Flask server on {host}:{port}")
-                # Use Flask's built-in development server
-                self.app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+                self.logger.info(f"Starting {backend.name} server on {host}:{port} ({threads} threads)")
+                backend.serve_forever()
             except Exception as e:
                 self.logger.error(f"Flask server error: {e}")
-                self.is_running = False
+            finally:
+                # A server stopped by a restart must not mark its replacement as stopped
+                if self.backend is backend:
+                    self.is_running = False
         
-        self.server_thread = threading.Thread(target=run_server, daemon=True)
-        self.server_thread.start()
+        self.server_thread = threading.Thread(target=run_server, name="http-server", daemon=True)
         self.is_running = True
+        self.server_thread.start()
         self.logger.info(f"Flask server started on {host}:{port}")
+        
+        if warm_up is None:
+            warm_up = self.config_manager.get("warm_up_on_start", True)
+        if warm_up:
+            threading.Thread(target=self.warm_up, name="warm-up", daemon=True).start()
     
-    def stop_server(self):
-        """Stop Flask server"""
+    def stop_server(self, drain_timeout: Optional[float] = None, drain_jobs: bool = True):
+        """Stop the server gracefully.
+
+        Stops accepting connections, lets in-flight requests finish, waits for
+        queued print jobs (unless ``drain_jobs`` is False) and releases the port,
+        all within ``drain_timeout`` seconds (``shutdown_drain_timeout`` setting).
+        """
         if not self.is_running:
             self.logger.warning("Server is not running")
             return
         
-        # Note: Flask development server doesn't have a clean shutdown
-        # The daemon thread will be terminated when main process exits
+        if drain_timeout is None:
+            drain_timeout = self.config_manager.get("shutdown_drain_timeout", 30)
+        deadline = time.monotonic() + drain_timeout
+        
+        self.logger.info(f"Stopping server on {self.host}:{self.port}")
+        self.backend.shutdown(drain_timeout)
+        if self.server_thread and self.server_thread is not threading.current_thread():
+            self.server_thread.join(max(0.0, deadline - time.monotonic()))
+            if self.server_thread.is_alive():
+                self.logger.warning("In-flight requests did not finish before the shutdown deadline")
         self.is_running = False
-        self.logger.info("Flask server stopped")
+        
+        if drain_jobs:
+            pending = self.scheduler.pending_count()
+            if pending:
+                self.logger.info(f"Waiting for {pending} queued print job(s) to finish")
+            if not self.scheduler.drain(max(0.0, deadline - time.monotonic())):
+                self.logger.warning(f"{self.scheduler.pending_count()} print job(s) still queued "
+                                    f"after {drain_timeout}s shutdown deadline")
+        self.logger.info(f"Flask server stopped on {self.host}:{self.port}")
+    
+    def restart_server(self, host: Optional[str] = None, port: Optional[int] = None):
+        """Restart the server, optionally on a new host/port.
+
+        Queued print jobs keep running on their printer workers, so nothing is
+        dropped while the listener moves.
+        """
+        host = host if host is not None else self.host
+        port = port if port is not None else self.port
+        if self.is_running:
+            self.stop_server(drain_jobs=False)
+        self.start_server(host, port, warm_up=False)
     
     def is_server_running(self) -> bool:
         """Check if server is running"""
@@ -0,0 +1,186 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Type
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+
+class ServingBackend:
+    """A WSGI server that can be started on a thread and stopped cleanly.
+
+    The listening socket is bound in the constructor, so a busy port fails
+    immediately in the caller. serve_forever() blocks until shutdown() is called
+    from another thread; it then stops accepting connections, releases the port
+    and returns once in-flight requests have finished, or once the drain
+    ``timeout`` given to shutdown() has passed where the server supports it.
+    """
+
+    name = ""
+
+    def __init__(self, app, host: str, port: int, threads: int = 8, keep_alive: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self.app = app
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.keep_alive = keep_alive
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def serve_forever(self) -> None:
+        raise NotImplementedError
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Werkzeug request handler without per-request access logging"""
+
+    def log_request(self, code="-", size="-"):
+        # Request logging is done by the application
+        pass
+
+
+class _PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server that handles connections on a fixed-size thread pool"""
+
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: int, handler):
+        super().__init__(host, port, app, handler=handler)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="http")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class WerkzeugBackend(ServingBackend):
+    """Werkzeug WSGI server on a bounded thread pool.
+
+    Werkzeug always closes the connection after each response, so
+    ``keep_alive`` only bounds how long an idle or slow socket may hold a
+    pool thread. Use waitress for real keep-alive.
+    """
+
+    name = "werkzeug"
+
+    def __init__(self, app, host: str, port: int, threads: int = 8, keep_alive: float = 5.0):
+        super().__init__(app, host, port, threads, keep_alive)
+        handler = type("TimeoutRequestHandler", (_QuietRequestHandler,), {"timeout": keep_alive})
+        self.server = _PooledWSGIServer(host, port, app, threads, handler)
+
+    def serve_forever(self) -> None:
+        try:
+            # Werkzeug closes the listening socket when serve_forever returns
+            self.server.serve_forever(poll_interval=0.2)
+        finally:
+            # Let in-flight requests finish
+            self.server.executor.shutdown(wait=True)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        # The caller bounds the drain by joining the serving thread
+        self.server.shutdown()
+
+
+class WaitressBackend(ServingBackend):
+    """Waitress production WSGI server (pip install waitress)"""
+
+    name = "waitress"
+
+    def __init__(self, app, host: str, port: int, threads: int = 8, keep_alive: float = 5.0):
+        super().__init__(app, host, port, threads, keep_alive)
+        from waitress.server import create_server
+
+        self.server = create_server(
+            app, host=host, port=port, threads=threads,
+            channel_timeout=max(1, int(keep_alive)), ident="LabelPrinter"
+        )
+        # Set by shutdown(), possibly before serve_forever() has started
+        self._stopping = False
+        self._drain_deadline: Optional[float] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import waitress  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def serve_forever(self) -> None:
+        from waitress import wasyncore
+        from waitress.channel import HTTPChannel
+
+        socket_map = self.server._map
+        listening = True
+        try:
+            while True:
+                wasyncore.loop(timeout=0.2, map=socket_map, use_poll=self.server.adj.asyncore_use_poll,
+                               count=1)
+                if not self._stopping:
+                    continue
+
+                if listening:
+                    # Stop accepting new connections and release the port
+                    wasyncore.dispatcher.close(self.server)
+                    listening = False
+
+                # Close idle keep-alive connections; busy ones finish their request first
+                channels = [c for c in list(socket_map.values()) if isinstance(c, HTTPChannel)]
+                for channel in channels:
+                    if not channel.requests and not channel.total_outbufs_len:
+                        channel.will_close = True
+                if not channels or self._drain_remaining() == 0:
+                    break
+        finally:
+            wasyncore.close_all(socket_map)
+            self.server.task_dispatcher.shutdown(cancel_pending=False, timeout=self._drain_remaining())
+
+    def _drain_remaining(self) -> float:
+        """Seconds left to finish in-flight requests (5 if shutdown() gave no timeout)"""
+        if self._drain_deadline is None:
+            return 5.0
+        return max(0.0, self._drain_deadline - time.monotonic())
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        if timeout is not None:
+            self._drain_deadline = time.monotonic() + timeout
+        self._stopping = True
+        # Wake the event loop so it notices the flag
+        self.server.pull_trigger()
+
+
+BACKENDS: Dict[str, Type[ServingBackend]] = {
+    WaitressBackend.name: WaitressBackend,
+    WerkzeugBackend.name: WerkzeugBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """Names of serving backends that can be used in this environment"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def create_backend(name: str, app, host: str, port: int, threads: int = 8,
+                   keep_alive: float = 5.0) -> ServingBackend:
+    """Create and bind a serving backend; ``auto`` prefers waitress when installed"""
+    if name == "auto":
+        name = available_backends()[0]
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown server backend '{name}'. Available: {', '.join(BACKENDS)}")
+    if not backend_class.is_available():
+        raise ImportError(f"Server backend '{name}' is not installed")
+    return backend_class(app, host, port, threads, keep_alive)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Benchmark the print pipeline with the mock printer.
+
+Drives PrinterManager.print_image / print_image_batch and the Flask
+/print/<button_id> route with synthetic PNG and SVG labels of several sizes,
+quantities and concurrency levels, and writes latency percentiles,
+throughput and peak RSS as JSON so runs can be compared across versions.
+
+    python test_scripts/benchmark_print_pipeline.py --output bench.json
+    python test_scripts/benchmark_print_pipeline.py --quick
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LABEL_SIZES = {
+    "small": (400, 200),
+    "medium": (1200, 600),
+    "large": (2400, 1200),
+}
+
+
+def make_png_label(path, size):
+    """A label-like PNG: border, text lines and a barcode-ish pattern"""
+    width, height = size
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([4, 4, width - 5, height - 5], outline="black", width=max(2, width // 200))
+    for i in range(4):
+        y = height // 10 + i * height // 8
+        draw.text((width // 20, y), f"PART-{i:04d}  Lot 2024-{i}", fill="black")
+    bar_top = height * 2 // 3
+    for x in range(width // 20, width - width // 20, max(2, width // 150)):
+        if (x * 7) % 3:
+            draw.rectangle([x, bar_top, x + max(1, width // 300), height - height // 10], fill="black")
+    img.save(path, "PNG")
+
+
+def make_svg_label(path, size):
+    """An SVG label with shapes and text, roughly matching make_png_label"""
+    width, height = size
+    bars = "".join(
+        f'<rect x="{x}" y="{height * 2 // 3}" width="{max(1, width // 300)}" '
+        f'height="{height // 4}" fill="black"/>'
+        for x in range(width // 20, width - width // 20, max(2, width // 150)) if (x * 7) % 3
+    )
+    texts = "".join(
+        f'<text x="{width // 20}" y="{height // 6 + i * height // 8}" '
+        f'font-size="{height // 12}" font-family="Helvetica">PART-{i:04d} Lot 2024-{i}</text>'
+        for i in range(4)
+    )
+    with open(path, "w") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">'
+            f'<rect x="4" y="4" width="{width - 8}" height="{height - 8}" fill="white" '
+            f'stroke="black" stroke-width="3"/>{texts}{bars}</svg>'
+        )
+
+
+def make_labels(directory):
+    labels = {}
+    for name, size in LABEL_SIZES.items():
+        png_path = os.path.join(directory, f"label_{name}.png")
+        svg_path = os.path.join(directory, f"label_{name}.svg")
+        make_png_label(png_path, size)
+        make_svg_label(svg_path, size)
+        labels[f"png_{name}"] = png_path
+        labels[f"svg_{name}"] = svg_path
+    return labels
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies, wall_seconds, operations):
+    values = sorted(latencies)
+    return {
+        "samples": len(values),
+        "p50_ms": _ms(percentile(values, 50)),
+        "p95_ms": _ms(percentile(values, 95)),
+        "p99_ms": _ms(percentile(values, 99)),
+        "max_ms": _ms(values[-1] if values else None),
+        "mean_ms": _ms(sum(values) / len(values) if values else None),
+        "wall_seconds": round(wall_seconds, 4),
+        "throughput_per_second": round(operations / wall_seconds, 2) if wall_seconds > 0 else None,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 3)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def reset_caches(manager):
+    manager.bitmap_cache.invalidate()
+    manager.render_cache.clear()
+    manager.parsed_svg_cache.clear()
+
+
+def bench_print_image(manager, printer, labels, iterations):
+    """print_image per label, cold (caches cleared before each call) and hot"""
+    results = []
+    for label_name, path in labels.items():
+        for mode in ("cold", "hot"):
+            latencies = []
+            failures = 0
+            if mode == "hot":
+                manager.print_image(path, printer)  # prime
+            started = time.perf_counter()
+            for _ in range(iterations):
+                if mode == "cold":
+                    reset_caches(manager)
+                t0 = time.perf_counter()
+                if not manager.print_image(path, printer):
+                    failures += 1
+                latencies.append(time.perf_counter() - t0)
+            wall = time.perf_counter() - started
+            result = {"benchmark": "print_image", "label": label_name, "cache": mode, "failures": failures}
+            result.update(summarize(latencies, wall, iterations))
+            results.append(result)
+    return results
+
+
+def bench_print_batch(manager, printer, labels, quantities, iterations):
+    """print_image_batch for several copy counts on a warm cache"""
+    results = []
+    for label_name in ("png_medium", "svg_medium"):
+        path = labels[label_name]
+        manager.print_image(path, printer)  # prime
+        for quantity in quantities:
+            latencies = []
+            copies = 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                t0 = time.perf_counter()
+                copies += manager.print_image_batch(path, printer, "portrait", quantity)
+                latencies.append(time.perf_counter() - t0)
+            wall = time.perf_counter() - started
+            result = {"benchmark": "print_image_batch", "label": label_name, "quantity": quantity,
+                      "copies_printed": copies, "copies_per_second": round(copies / wall, 2)}
+            result.update(summarize(latencies, wall, iterations))
+            results.append(result)
+    return results
+
+
+def bench_http(manager, printer, labels, concurrency_levels, requests_per_level, quantity):
+    """POST /print/<id> through the Flask app from N client threads.
+
+    Reports the acknowledgement latency seen by the client and the time until
+    each queued job has printed.
+    """
+    from config.config_manager import ConfigManager
+    from server.flask_app import FlaskPrintServer
+
+    config_manager = ConfigManager(os.path.join(os.getcwd(), "bench_config.json"))
+    config_manager.set_selected_printer(printer)
+    for label_name, path in labels.items():
+        config_manager.add_button_mapping(label_name, path, "portrait")
+
+    server = FlaskPrintServer(config_manager, manager)
+    server.scheduler.max_queue_per_printer = max(concurrency_levels) * 4
+    manager.warm_labels([(path, "portrait") for path in labels.values()], printer)
+
+    results = []
+    button_ids = list(labels)
+    for concurrency in concurrency_levels:
+        client_local = threading.local()
+
+        def press(index):
+            client = getattr(client_local, "client", None)
+            if client is None:
+                client = client_local.client = server.app.test_client()
+            button_id = button_ids[index % len(button_ids)]
+            t0 = time.perf_counter()
+            response = client.post(f"/print/{button_id}?quantity={quantity}",
+                                   data=f"/print/{button_id}", content_type="text/plain")
+            return time.perf_counter() - t0, response.status_code, (response.get_json() or {}).get("job_id")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            responses = list(pool.map(press, range(requests_per_level)))
+        server.scheduler.drain(120)
+        wall = time.perf_counter() - started
+
+        ack_latencies = [latency for latency, _, _ in responses]
+        statuses = {}
+        for _, status, _ in responses:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        jobs = [server.scheduler.get_job(job_id) for _, _, job_id in responses if job_id]
+        job_latencies = [job.finished_at - job.created_at for job in jobs if job and job.finished_at]
+
+        result = {"benchmark": "http_print", "concurrency": concurrency, "quantity": quantity,
+                  "statuses": statuses}
+        result.update(summarize(ack_latencies, wall, requests_per_level))
+        job_summary = summarize(job_latencies, wall, len(job_latencies))
+        result["job"] = {key: job_summary[key] for key in ("samples", "p50_ms", "p95_ms", "p99_ms", "max_ms")}
+        results.append(result)
+
+    config_manager.flush()
+    return results
+
+
+def run(args):
+    from printing.printer_manager import PrinterManager
+
+    work_dir = tempfile.mkdtemp(prefix="label_bench_")
+    original_dir = os.getcwd()
+    os.chdir(work_dir)  # mock prints and caches go to the scratch directory
+    results = []
+    try:
+        labels = make_labels(work_dir)
+        # The mock printer path prints banners for every job; keep them out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend = None
+            if args.virtual:
+                # Emulated spooler timing instead of the instant mock printer
+                from printing.backends.virtual_spooler import VirtualSpoolerBackend
+                backend = VirtualSpoolerBackend(
+                    page_seconds=args.page_ms / 1000.0, accept_seconds=args.accept_ms / 1000.0,
+                    spool_limit=1000, seed=1
+                )
+            manager = PrinterManager(render_cache_dir=os.path.join(work_dir, "render_cache"), backend=backend)
+            printer = manager.get_available_printers()[0]
+
+            stages = [
+                ("print_image", lambda: bench_print_image(manager, printer, labels, args.iterations)),
+                ("print_image_batch", lambda: bench_print_batch(
+                    manager, printer, labels, args.quantities, args.iterations)),
+                ("http_print", lambda: bench_http(
+                    manager, printer, labels, args.concurrency, args.requests, args.http_quantity)),
+            ]
+            for name, stage in stages:
+                if args.only and name not in args.only:
+                    continue
+                print(f"Running {name}...", file=sys.stderr)
+                stage_results = stage()
+                for result in stage_results:
+                    result["peak_rss_bytes"] = peak_rss_bytes()
+                results.extend(stage_results)
+    finally:
+        os.chdir(original_dir)
+        if args.keep:
+            print(f"Kept benchmark files in {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "iterations": args.iterations,
+            "backend": "virtual" if args.virtual else "mock",
+            "label_sizes": LABEL_SIZES,
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+        "results": results,
+    }
+
+
+def print_table(report):
+    print(f"{'benchmark':<18} {'case':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9}")
+    for r in report["results"]:
+        case = " ".join(
+            f"{key}={r[key]}" for key in ("label", "cache", "quantity", "concurrency") if key in r
+        )
+        print(f"{r['benchmark']:<18} {case:<28} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['p99_ms']:>9} {r['throughput_per_second']:>9}")
+    rss = report["peak_rss_bytes"]
+    if rss:
+        print(f"\nPeak RSS: {rss / (1024 * 1024):.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the label print pipeline (mock printer)")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per print_image/batch case")
+    parser.add_argument("--quantities", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=100, help="HTTP requests per concurrency level")
+    parser.add_argument("--http-quantity", type=int, default=1)
+    parser.add_argument("--only", nargs="+", choices=["print_image", "print_image_batch", "http_print"])
+    parser.add_argument("--virtual", action="store_true",
+                        help="Use the virtual spooler backend (emulated accept and page times)")
+    parser.add_argument("--accept-ms", type=float, default=50.0, help="Virtual spool acceptance time")
+    parser.add_argument("--page-ms", type=float, default=0.0,
+                        help="Virtual time per printed page (the spooler prints in the background)")
+    parser.add_argument("--quick", action="store_true", help="Small run for a smoke test")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated labels and mock prints")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.iterations = 3
+        args.quantities = [1, 5]
+        args.concurrency = [1, 4]
+        args.requests = 12
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print_table(report)
+        print(f"\nReport written to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
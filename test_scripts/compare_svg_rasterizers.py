@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compare the installed SVG rendering engines on a set of labels.
+
+For every label and DPI, each engine parses and renders the SVG several
+times. The report gives the best parse and render times and, for every
+engine other than the reference (reportlab), how far its pixels are from
+the reference render: mean absolute difference and the share of pixels
+that differ by more than a quarter of the gray range.
+
+    python test_scripts/compare_svg_rasterizers.py                  # synthetic labels
+    python test_scripts/compare_svg_rasterizers.py labels/*.svg --dpi 203 300 -o svg.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from benchmark_print_pipeline import LABEL_SIZES, make_svg_label
+from printing.svg_rasterizers import RASTERIZERS, available_rasterizers
+
+REFERENCE = "reportlab"
+
+
+def best_time(function, runs):
+    best, result = float("inf"), None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def pixel_difference(image, reference):
+    """Mean absolute gray difference (0..1) and share of clearly different pixels"""
+    if image.size != reference.size:
+        # Engines may round the output size differently by a pixel
+        image = image.resize(reference.size, Image.LANCZOS)
+    a = np.asarray(image.convert("L"), dtype=np.int16)
+    b = np.asarray(reference.convert("L"), dtype=np.int16)
+    difference = np.abs(a - b)
+    return float(difference.mean() / 255.0), float((difference > 64).mean())
+
+
+def compare(labels, engines, dpis, runs):
+    results = []
+    for label_name, path in labels.items():
+        for dpi in dpis:
+            renders = {}
+            for name in engines:
+                rasterizer = RASTERIZERS[name]()
+                entry = {"label": label_name, "dpi": dpi, "engine": name}
+                try:
+                    parse_seconds, document = best_time(lambda: rasterizer.load(path), runs)
+                    render_seconds, image = best_time(lambda: rasterizer.render(document, dpi), runs)
+                except Exception as e:
+                    entry["error"] = str(e)
+                    results.append(entry)
+                    continue
+                renders[name] = image
+                entry.update({
+                    "parse_ms": round(parse_seconds * 1000, 2),
+                    "render_ms": round(render_seconds * 1000, 2),
+                    "total_ms": round((parse_seconds + render_seconds) * 1000, 2),
+                    "size": list(image.size),
+                    "size_points": [round(v, 2) for v in rasterizer.size(document)],
+                })
+                results.append(entry)
+
+            reference = renders.get(REFERENCE)
+            for entry in results[-len(engines):]:
+                image = renders.get(entry["engine"])
+                if reference is not None and image is not None and entry["engine"] != REFERENCE:
+                    entry["mean_difference"], entry["different_pixels"] = pixel_difference(image, reference)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SVG rendering engines on label files")
+    parser.add_argument("labels", nargs="*", help="SVG files (default: synthetic labels)")
+    parser.add_argument("--engines", nargs="+", help="Engines to compare (default: all installed)")
+    parser.add_argument("--dpi", type=float, nargs="+", default=[72, 203, 300])
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per measurement (best is kept)")
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    engines = args.engines or available_rasterizers()
+    missing = [name for name in engines if name not in available_rasterizers()]
+    if missing:
+        parser.error(f"Not installed: {', '.join(missing)}. Installed: {', '.join(available_rasterizers())}")
+
+    work_dir = None
+    if args.labels:
+        labels = {os.path.basename(path): path for path in args.labels}
+    else:
+        work_dir = tempfile.mkdtemp(prefix="svg_compare_")
+        labels = {}
+        for name, size in LABEL_SIZES.items():
+            labels[f"svg_{name}"] = os.path.join(work_dir, f"label_{name}.svg")
+            make_svg_label(labels[f"svg_{name}"], size)
+
+    try:
+        results = compare(labels, engines, args.dpi, args.runs)
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    for entry in results:
+        if "error" in entry:
+            line = f"error: {entry['error']}"
+        else:
+            line = f"parse {entry['parse_ms']:8.2f} ms  render {entry['render_ms']:8.2f} ms  {entry['size']}"
+            if "mean_difference" in entry:
+                line += (f"  diff {entry['mean_difference']:.4f}"
+                         f"  ({entry['different_pixels']:.2%} pixels)")
+        print(f"{entry['label']:>16s} @ {entry['dpi']:g} dpi  {entry['engine']:10s} {line}", file=sys.stderr)
+
+    report = {"engines": engines, "reference": REFERENCE, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
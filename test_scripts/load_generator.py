@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Load generator that emulates a fleet of ESP32 button boxes.
+
+Each simulated device behaves like the firmware in httpHandler.cpp: one
+request at a time, a fresh connection per press, POST /print/<id>?quantity=N
+with a text/plain body and a 3 second deadline. Presses arrive as a Poisson
+process per device, and now and then an operator hammers a button several
+times in a row (a burst).
+
+The fleet size is stepped up to find where the server saturates. For each
+step the report gives the timeout rate at the device deadline, tail latency,
+HTTP status counts and the deepest print queue seen on /status.
+
+    python test_scripts/load_generator.py --local --steps 5 20 50 --duration 20
+    python test_scripts/load_generator.py --url http://192.168.1.10:9000 --buttons 1 2 3
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import logging
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import contextlib
+import http.client
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_print_pipeline import make_png_label, percentile, peak_rss_bytes
+
+DEVICE_TIMEOUT = 3.0  # HTTPClient::setTimeout(3000) in the firmware
+
+
+class StepStats:
+    """Outcomes of every press during one load step"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.statuses = {}
+        self.timeouts = 0
+        self.connection_errors = 0
+        self.presses = 0
+
+    def record(self, latency, outcome):
+        with self.lock:
+            self.presses += 1
+            if outcome == "timeout":
+                self.timeouts += 1
+            elif outcome == "connection_error":
+                self.connection_errors += 1
+            else:
+                self.statuses[outcome] = self.statuses.get(outcome, 0) + 1
+                self.latencies.append(latency)
+
+
+def press_button(host, port, button_id, quantity, timeout):
+    """Send one press the way the firmware does; returns (latency, outcome)"""
+    path = f"/print/{button_id}?quantity={quantity}"
+    body = f"http://{host}:{port}{path}"
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("POST", path, body=body, headers={"Content-Type": "text/plain"})
+        response = connection.getresponse()
+        response.read()
+        return time.perf_counter() - started, str(response.status)
+    except (socket.timeout, TimeoutError):
+        return time.perf_counter() - started, "timeout"
+    except (OSError, http.client.HTTPException):
+        return time.perf_counter() - started, "connection_error"
+    finally:
+        connection.close()
+
+
+class Device(threading.Thread):
+    """One button box: Poisson presses plus occasional bursts"""
+
+    def __init__(self, index, args, host, port, stats, stop_event, seed):
+        super().__init__(name=f"device-{index}", daemon=True)
+        self.args = args
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.stop_event = stop_event
+        self.random = random.Random(seed)
+
+    def run(self):
+        rate_per_second = self.args.presses_per_minute / 60.0
+        # Devices do not all boot at the same moment
+        if self.stop_event.wait(self.random.uniform(0, 1.0 / rate_per_second)):
+            return
+        while not self.stop_event.is_set():
+            presses = 1
+            if self.random.random() < self.args.burst_probability:
+                presses = self.random.randint(2, self.args.burst_size)
+            for i in range(presses):
+                if self.stop_event.is_set():
+                    return
+                self.press()
+                if i + 1 < presses and self.stop_event.wait(self.random.uniform(0.1, 0.4)):
+                    return
+            if self.stop_event.wait(self.random.expovariate(rate_per_second)):
+                return
+
+    def press(self):
+        button_id = self.random.choice(self.args.buttons)
+        quantity = 1 if self.random.random() < 0.8 else self.random.randint(2, self.args.max_quantity)
+        latency, outcome = press_button(self.host, self.port, button_id, quantity, self.args.timeout)
+        self.stats.record(latency, outcome)
+
+
+def poll_queue_depth(host, port, stop_event, samples):
+    """Record pending_jobs from /status every half second"""
+    while not stop_event.wait(0.5):
+        connection = http.client.HTTPConnection(host, port, timeout=2)
+        try:
+            connection.request("GET", "/status")
+            data = json.loads(connection.getresponse().read())
+            samples.append(data.get("pending_jobs", 0))
+        except Exception:
+            pass
+        finally:
+            connection.close()
+
+
+def run_step(devices, args, host, port, seed):
+    stats = StepStats()
+    stop_event = threading.Event()
+    depth_samples = []
+    fleet = [Device(i, args, host, port, stats, stop_event, seed * 100003 + i) for i in range(devices)]
+    monitor = threading.Thread(target=poll_queue_depth, args=(host, port, stop_event, depth_samples), daemon=True)
+
+    started = time.perf_counter()
+    monitor.start()
+    for device in fleet:
+        device.start()
+    time.sleep(args.duration)
+    stop_event.set()
+    for device in fleet:
+        device.join(args.timeout + 1)
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(stats.latencies)
+    failures = stats.timeouts + stats.connection_errors + sum(
+        count for status, count in stats.statuses.items() if not status.startswith("2")
+    )
+    return {
+        "devices": devices,
+        "duration_seconds": round(elapsed, 2),
+        "presses": stats.presses,
+        "offered_presses_per_second": round(devices * args.presses_per_minute / 60.0, 2),
+        "achieved_presses_per_second": round(stats.presses / elapsed, 2),
+        "statuses": stats.statuses,
+        "timeouts": stats.timeouts,
+        "connection_errors": stats.connection_errors,
+        "timeout_rate": round(stats.timeouts / stats.presses, 4) if stats.presses else 0.0,
+        "failure_rate": round(failures / stats.presses, 4) if stats.presses else 0.0,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "max_ms": _ms(latencies[-1] if latencies else None),
+        "max_pending_jobs": max(depth_samples) if depth_samples else None,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 1)
+
+
+def is_saturated(step, args):
+    """A step is saturated when devices start missing their deadline or getting errors"""
+    p99 = step["p99_ms"]
+    return (step["failure_rate"] > args.max_failure_rate
+            or (p99 is not None and p99 > args.timeout * 1000 * 0.8))
+
+
+@contextlib.contextmanager
+def local_server(port, buttons):
+    """Run the print server in-process with the mock printer and a synthetic label"""
+    from config.config_manager import ConfigManager
+    from printing.printer_manager import PrinterManager
+    from server.flask_app import FlaskPrintServer
+
+    work_dir = tempfile.mkdtemp(prefix="label_load_")
+    original_dir = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        label_path = os.path.join(work_dir, "label.png")
+        make_png_label(label_path, (800, 400))
+        # Keep the mock print banners and per-request warnings out of the output
+        logging.getLogger().setLevel(logging.ERROR)
+        with contextlib.redirect_stdout(io.StringIO()):
+            printer_manager = PrinterManager()
+            config_manager = ConfigManager(os.path.join(work_dir, "config.json"))
+            config_manager.set_selected_printer(printer_manager.get_available_printers()[0])
+            for button_id in buttons:
+                config_manager.add_button_mapping(str(button_id), label_path)
+            server = FlaskPrintServer(config_manager, printer_manager)
+            server.start_server("127.0.0.1", port, warm_up=True)
+            try:
+                yield server
+            finally:
+                server.stop_server(drain_timeout=10)
+                config_manager.flush()
+    finally:
+        os.chdir(original_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate a fleet of ESP32 label buttons")
+    parser.add_argument("--url", default="http://127.0.0.1:9000", help="Print server base URL")
+    parser.add_argument("--local", action="store_true",
+                        help="Start an in-process server with the mock printer on the --url port")
+    parser.add_argument("--steps", type=int, nargs="+", default=[5, 10, 20, 40],
+                        help="Fleet sizes to run, in order")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per step")
+    parser.add_argument("--presses-per-minute", type=float, default=6.0, help="Mean presses per device")
+    parser.add_argument("--burst-probability", type=float, default=0.1,
+                        help="Chance that a press is a burst of repeated presses")
+    parser.add_argument("--burst-size", type=int, default=5, help="Largest burst")
+    parser.add_argument("--max-quantity", type=int, default=10, help="Largest quantity per press")
+    parser.add_argument("--buttons", nargs="+", default=["1", "2", "3", "4"], help="Button IDs to press")
+    parser.add_argument("--timeout", type=float, default=DEVICE_TIMEOUT, help="Device deadline in seconds")
+    parser.add_argument("--max-failure-rate", type=float, default=0.01,
+                        help="Failure rate above which a step counts as saturated")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", "-o", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    target = urlsplit(args.url)
+    host, port = target.hostname, target.port or 80
+
+    steps = []
+    saturation = None
+    server_context = local_server(port, args.buttons) if args.local else contextlib.nullcontext()
+    with server_context:
+        for index, devices in enumerate(args.steps):
+            print(f"Running {devices} devices for {args.duration:.0f}s...", file=sys.stderr)
+            step = run_step(devices, args, host, port, args.seed + index)
+            steps.append(step)
+            print(f"  {step['achieved_presses_per_second']}/s  p99 {step['p99_ms']} ms  "
+                  f"timeouts {step['timeout_rate']:.2%}  failures {step['failure_rate']:.2%}  "
+                  f"max queue {step['max_pending_jobs']}", file=sys.stderr)
+            if saturation is None and is_saturated(step, args):
+                saturation = devices
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "url": args.url,
+            "local_server": args.local,
+            "device_timeout_seconds": args.timeout,
+            "presses_per_minute": args.presses_per_minute,
+            "burst_probability": args.burst_probability,
+            "burst_size": args.burst_size,
+        },
+        "saturation_devices": saturation,
+        "peak_rss_bytes": peak_rss_bytes() if args.local else None,
+        "steps": steps,
+    }
+    if saturation is None:
+        print(f"No saturation up to {args.steps[-1]} devices", file=sys.stderr)
+    else:
+        print(f"Saturated at {saturation} devices", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
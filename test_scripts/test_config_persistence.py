@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for config saving: debounced writes, atomic replace, .bak recovery
+and the final flush at shutdown
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import config_writer
+from config.config_manager import ConfigManager
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_config_persistence():
+    """Check that config changes are coalesced, never half-written and recoverable"""
+    print("🧪 Testing Config Persistence")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="config_persistence_")
+    config_path = os.path.join(work_dir, "config.json")
+
+    print("\n1. Debounced saves are coalesced into one write...")
+    manager = ConfigManager(config_path, save_debounce=0.3)
+    writes = []
+    on_written = manager._writer._on_written
+    manager._writer._on_written = lambda: (writes.append(time.monotonic()), on_written())
+    for i in range(10):
+        manager.set("selected_printer", f"Printer {i}")
+        manager.save_config()
+    written_early = os.path.exists(config_path)
+    time.sleep(0.8)
+    print(f"   Written before the debounce: {written_early}, writes: {len(writes)}")
+    ok &= not written_early and len(writes) == 1
+    ok &= read_json(config_path)["selected_printer"] == "Printer 9"
+
+    print("\n2. A crash in the middle of a write leaves the old file...")
+    manager.set("selected_printer", "Printer 10")
+    manager.save_config(immediate=True)
+    manager.set("selected_printer", "Crashed")
+
+    def crashing_dump(data, f, **kwargs):
+        f.write(json.dumps(data)[:20])  # part of the new content, then the process dies
+        raise OSError("simulated crash")
+
+    real_dump = config_writer.json.dump
+    config_writer.json.dump = crashing_dump
+    try:
+        saved = manager.save_config(immediate=True)
+    finally:
+        config_writer.json.dump = real_dump
+    leftovers = [name for name in os.listdir(work_dir) if name.endswith(".tmp")]
+    print(f"   Save result: {saved}, file: {read_json(config_path)['selected_printer']}, "
+          f"temp files left: {leftovers}")
+    ok &= not saved and read_json(config_path)["selected_printer"] == "Printer 10" and not leftovers
+
+    print("\n3. A corrupt config file falls back to the .bak copy...")
+    manager.set("selected_printer", "Printer 11")
+    manager.save_config(immediate=True)
+    # The backup holds the file as it was before the last write
+    backup = read_json(config_path + ".bak")["selected_printer"]
+    with open(config_path, "w") as f:
+        f.write('{"selected_printer": "Printer 1')
+    recovered = ConfigManager(config_path).get_selected_printer()
+    print(f"   Backup: {backup}, recovered: {recovered}")
+    ok &= backup == "Printer 10" and recovered == "Printer 10"
+
+    print("\n4. A pending save is written when the process exits...")
+    shutdown_path = os.path.join(work_dir, "shutdown.json")
+    script = (
+        "from config.config_manager import ConfigManager\n"
+        f"manager = ConfigManager({shutdown_path!r}, save_debounce=60)\n"
+        "manager.set('selected_printer', 'Saved at exit')\n"
+        "manager.save_config()\n"
+    )
+    started = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, timeout=30)
+    elapsed = time.monotonic() - started
+    saved_at_exit = os.path.exists(shutdown_path) and read_json(shutdown_path)["selected_printer"]
+    print(f"   Saved: {saved_at_exit!r} in {elapsed:.2f}s (debounce 60 s)")
+    ok &= saved_at_exit == "Saved at exit" and elapsed < 30
+
+    print(f"\n{'🎉 Config persistence test PASSED!' if ok else '❌ Config persistence test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_config_persistence() else 1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for config hot reload and immutable config snapshots
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config_manager import ConfigManager
+
+
+def test_config_reload():
+    """Check external edits are reloaded once, snapshots are read-only and old setters persist"""
+    print("🧪 Testing Config Reload and Snapshots")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="config_reload_")
+    config_path = os.path.join(work_dir, "config.json")
+    manager = ConfigManager(config_path, save_debounce=0.05)
+    manager.add_button_mapping("1", "one.png")
+    manager.add_button_mapping("2", "two.svg", "landscape")
+    manager.save_config(immediate=True)
+
+    reloads = []
+    manager.add_reload_listener(reloads.append)
+    manager.start_watching(interval=0.1)
+
+    print("\n1. Our own save is not reported as an external edit...")
+    manager.set("selected_printer", "DYMO LabelWriter 450")
+    manager.save_config()
+    time.sleep(0.5)
+    print(f"   Reloads: {reloads}")
+    ok &= reloads == []
+
+    print("\n2. An external edit is picked up once...")
+    unchanged = manager.get_mapping_entry("1")
+    with open(config_path) as f:
+        data = json.load(f)
+    data["button_mappings"]["2"] = {"file": "two_v2.svg", "orientation": "portrait"}
+    data["button_mappings"]["3"] = "three.png"  # old plain path format
+    with open(config_path, "w") as f:
+        json.dump(data, f)
+    time.sleep(0.6)
+    print(f"   Reloads: {reloads}, button 2: {manager.get_mapping_entry('2')}")
+    ok &= reloads == [{"2", "3"}]
+    ok &= manager.get_mapping_entry("2").file == "two_v2.svg"
+    ok &= manager.get_mapping_entry("3").orientation == "portrait"
+    # Unchanged mappings keep their entries
+    ok &= manager.get_mapping_entry("1") is unchanged
+
+    print("\n3. Snapshots cannot be modified...")
+    snapshot = manager.snapshot()
+    attempts = [
+        lambda: snapshot.data.__setitem__("selected_printer", "Other"),
+        lambda: snapshot.mappings.__setitem__("4", unchanged),
+        lambda: snapshot.get("button_mappings").__setitem__("4", "four.png"),
+        lambda: manager.get("printer_backends").append("cups"),
+    ]
+    rejected = 0
+    for attempt in attempts:
+        try:
+            attempt()
+        except (TypeError, AttributeError):
+            rejected += 1
+    manager.set("selected_printer", "HP LaserJet Pro")
+    print(f"   Rejected writes: {rejected}/{len(attempts)}, old snapshot printer: "
+          f"{snapshot.get('selected_printer')}")
+    ok &= rejected == len(attempts) and snapshot.get("selected_printer") == "DYMO LabelWriter 450"
+    ok &= manager.snapshot().version > snapshot.version
+
+    print("\n4. The older setters still persist...")
+    manager.update_button_mapping("1", orientation="landscape")
+    manager.set_selected_printer("Canon PIXMA")
+    manager.save_config()
+    manager.flush()
+    manager.stop_watching()
+    reopened = ConfigManager(config_path)
+    print(f"   Reopened: button 1 {reopened.get_mapping_entry('1')}, printer {reopened.get_selected_printer()}")
+    ok &= reopened.get_mapping_entry("1").orientation == "landscape"
+    ok &= reopened.get_selected_printer() == "Canon PIXMA"
+    ok &= len(reloads) == 1
+
+    print(f"\n{'🎉 Config reload test PASSED!' if ok else '❌ Config reload test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_config_reload() else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the 1-bit monochrome label pipeline
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image, ImageDraw
+from printing import monochrome
+from printing.printer_manager import PrinterManager
+
+
+def make_label(size=(812, 1218)):
+    """Text-like bars and a barcode on top, a gray ramp at the bottom"""
+    width, height = size
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for row in range(8):
+        draw.rectangle((40, 40 + row * 50, 40 + (row * 97) % (width - 80), 70 + row * 50), fill='black')
+    for x in range(40, width - 40, 6):
+        draw.rectangle((x, 480, x + (x // 6) % 3, 640), fill='black')
+    ramp = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height - 700, 1))
+    image.paste(Image.fromarray(ramp).convert('RGB'), (0, 700))
+    return image
+
+
+def reference_atkinson(gray):
+    """Straightforward per-pixel Atkinson, to check the optimized one against"""
+    work = gray.astype(np.float64)
+    height, width = work.shape
+    dots = np.zeros((height, width), dtype=bool)
+    for y in range(height):
+        for x in range(width):
+            value = work[y, x]
+            dots[y, x] = value < monochrome.THRESHOLD
+            error = (value - (0.0 if dots[y, x] else 255.0)) / 8.0
+            for dx, dy in ((1, 0), (2, 0), (-1, 1), (0, 1), (1, 1), (0, 2)):
+                if 0 <= x + dx < width and y + dy < height:
+                    work[y + dy, x + dx] += error
+    return dots
+
+
+def test_monochrome():
+    """Check every dithering method, 1 bpp packing and the PrinterManager integration"""
+    print("🧪 Testing Monochrome Label Pipeline")
+    print("=" * 50)
+    ok = True
+
+    label = make_label()
+    rgb_bytes = len(label.tobytes())
+
+    print("\n1. Dithering methods (label 812x1218)...")
+    results = {}
+    for method in monochrome.DITHER_METHODS:
+        started = time.perf_counter()
+        mono = monochrome.to_monochrome(label, method)
+        elapsed = time.perf_counter() - started
+        results[method] = monochrome.fidelity(label, mono)
+        print(f"   {method:16s} {elapsed * 1000:7.1f} ms  {len(mono.tobytes())} bytes "
+              f"(RGB {rgb_bytes})  tone error {results[method]['tone_error']:.3f}  "
+              f"coverage error {results[method]['coverage_error']:.3f}")
+        ok &= mono.mode == "1" and len(mono.tobytes()) * 24 <= rgb_bytes + 24 * label.height
+    # Error diffusion and ordered dithering keep the gray ramp; a plain threshold does not
+    for method in ("floyd_steinberg", "atkinson", "bayer"):
+        ok &= results[method]["tone_error"] < results["threshold"]["tone_error"]
+
+    print("\n2. Atkinson matches the per-pixel reference...")
+    small = np.asarray(label.convert('L').resize((120, 90)))
+    ok &= np.array_equal(monochrome.dither(Image.fromarray(small), "atkinson"), reference_atkinson(small))
+
+    print("\n3. Black and white labels survive thresholding exactly...")
+    bars = Image.new('RGB', (101, 40), 'white')
+    ImageDraw.Draw(bars).rectangle((0, 0, 100, 9), fill='black')
+    fidelity = monochrome.fidelity(bars, monochrome.to_monochrome(bars))
+    ok &= fidelity["tone_error"] == 0.0
+    data, bytes_per_row = monochrome.pack_rows(monochrome.dither(bars), dot_bit=1)
+    # 101 dots -> 13 bytes; the padding bits in the last byte are never dots
+    ok &= bytes_per_row == 13 and data[:13] == b"\xff" * 12 + b"\xf8"
+    data, _ = monochrome.pack_rows(monochrome.dither(bars), dot_bit=0)
+    ok &= data[:13] == b"\x00" * 12 + b"\x07"
+
+    print("\n4. Prepared labels are 1-bit and cached...")
+    work_dir = tempfile.mkdtemp(prefix="monochrome_")
+    label_path = os.path.join(work_dir, "label.png")
+    label.save(label_path)
+    manager = PrinterManager(render_cache_dir=os.path.join(work_dir, "render_cache"))
+    printer, other_printer = manager.get_available_printers()[:2]
+    manager.set_printer_monochrome({printer: "atkinson"})
+    prepared = manager.prepare_label(label_path, printer)
+    ok &= prepared.image.mode == "1" and manager.prepare_label(label_path, printer) is prepared
+    # Only listed printers get 1-bit labels
+    ok &= manager.prepare_label(label_path, other_printer).image.mode == "RGB"
+    manager.set_printer_monochrome({})
+    ok &= manager.prepare_label(label_path, printer).image.mode == "RGB"
+    print(f"   1-bit: {prepared.nbytes} bytes, RGB: {manager.prepare_label(label_path, printer).nbytes} bytes")
+
+    print(f"\n{'🎉 Monochrome test PASSED!' if ok else '❌ Monochrome test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_monochrome() else 1)
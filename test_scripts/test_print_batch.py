@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the /print/batch endpoint, using the Flask test client
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from config.config_manager import ConfigManager
+from printing.print_scheduler import PrintScheduler
+from printing.printer_manager import PrinterManager
+from server.flask_app import FlaskPrintServer
+
+
+def wait_for_jobs(client, job_ids, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        jobs = [client.get(f"/jobs/{job_id}").get_json()["job"] for job_id in job_ids]
+        if all(job["status"] in ("done", "failed") for job in jobs):
+            return jobs
+        time.sleep(0.05)
+    return jobs
+
+
+def test_print_batch():
+    """Check accepted batches, up-front validation and queue-full rejection"""
+    print("🧪 Testing Print Batch Endpoint")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="print_batch_")
+    label_path = os.path.join(work_dir, "label.png")
+    Image.new('RGB', (400, 200), 'white').save(label_path)
+
+    config_manager = ConfigManager(os.path.join(work_dir, "config.json"))
+    config_manager.set_selected_printer("DYMO LabelWriter 450")
+    config_manager.add_button_mapping("1", label_path)
+    config_manager.add_button_mapping("2", label_path, "landscape")
+    config_manager.add_button_mapping("3", os.path.join(work_dir, "missing.png"))
+    printer_manager = PrinterManager(render_cache_dir=os.path.join(work_dir, "render_cache"))
+    server = FlaskPrintServer(config_manager, printer_manager)
+    client = server.app.test_client()
+
+    print("\n1. A valid batch is queued with one job per item...")
+    response = client.post("/print/batch", json=[{"button_id": "1", "quantity": 2}, {"button_id": "2"}])
+    body = response.get_json()
+    job_ids = [item.get("job_id") for item in body.get("items", [])]
+    jobs = wait_for_jobs(client, job_ids)
+    print(f"   Status: {response.status_code}, jobs: {[(job['status'], job['printed']) for job in jobs]}")
+    ok &= response.status_code == 202 and body["group_id"] and len(set(job_ids)) == 2 and all(job_ids)
+    ok &= [(job["status"], job["printed"]) for job in jobs] == [("done", 2), ("done", 1)]
+    ok &= all(job["group_id"] == body["group_id"] for job in jobs)
+
+    print("\n2. A missing label file rejects the whole batch...")
+    known_jobs = len(server.scheduler._jobs)
+    response = client.post("/print/batch", json=[{"button_id": "1"}, {"button_id": "3", "quantity": 1}])
+    body = response.get_json()
+    errors = [item.get("error") for item in body["items"]]
+    print(f"   Status: {response.status_code}, errors: {errors}")
+    ok &= response.status_code == 400 and errors[0] is None and "not found" in errors[1]
+    ok &= len(server.scheduler._jobs) == known_jobs and server.scheduler.pending_count() == 0
+
+    print("\n3. A batch that does not fit the printer's queue gets 503...")
+    server.scheduler = PrintScheduler(printer_manager, max_queue_per_printer=2)
+    response = client.post("/print/batch", json=[{"button_id": "1"}] * 3)
+    print(f"   Status: {response.status_code}, Retry-After: {response.headers.get('Retry-After')}")
+    ok &= response.status_code == 503 and response.headers.get("Retry-After") == "1"
+    ok &= server.scheduler.pending_count() == 0 and not server.scheduler._jobs
+
+    print(f"\n{'🎉 Print batch test PASSED!' if ok else '❌ Print batch test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_print_batch() else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-printer print scheduler
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from printing.print_jobs import PrintError, PrintJob
+from printing.print_scheduler import PrintScheduler, SchedulerFullError
+
+
+class SlowPrinterManager:
+    """Stand-in printer manager that takes a fixed time per job and tracks concurrency"""
+
+    def __init__(self, seconds_per_job=0.2):
+        self.seconds_per_job = seconds_per_job
+        self.lock = threading.Lock()
+        self.active = {}
+        self.max_active_per_printer = {}
+        self.max_active_total = 0
+        self.order = []
+
+    def print_image_batch(self, image_path, printer_name, orientation="portrait", copies=1, dpi=None):
+        with self.lock:
+            self.active[printer_name] = self.active.get(printer_name, 0) + 1
+            self.max_active_per_printer[printer_name] = max(
+                self.max_active_per_printer.get(printer_name, 0), self.active[printer_name]
+            )
+            self.max_active_total = max(self.max_active_total, sum(self.active.values()))
+            self.order.append((printer_name, image_path))
+        time.sleep(self.seconds_per_job)
+        with self.lock:
+            self.active[printer_name] -= 1
+        if image_path == "missing.png":
+            raise FileNotFoundError(f"Image file not found: {image_path}")
+        if image_path == "jam.png":
+            raise PrintError("Print via virtual failed: paper jam", printed=1)
+        return copies
+
+
+def wait_for(jobs, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(job.is_finished() for job in jobs):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_print_scheduler():
+    """Test serialization per printer, parallelism across printers and backpressure"""
+    print("🧪 Testing Print Scheduler")
+    print("=" * 50)
+    ok = True
+
+    manager = SlowPrinterManager()
+    scheduler = PrintScheduler(manager, max_queue_per_printer=10)
+
+    print("\n1. Submitting 3 jobs to each of 2 printers...")
+    start = time.time()
+    jobs = []
+    for i in range(3):
+        for printer in ("Printer A", "Printer B"):
+            jobs.append(scheduler.submit(PrintJob(str(i), f"label_{i}.png", printer, quantity=2)))
+    finished = wait_for(jobs)
+    elapsed = time.time() - start
+    print(f"   All jobs finished: {finished} in {elapsed:.2f}s (serial would take ~1.2s)")
+    ok &= finished and elapsed < 1.0
+
+    print("\n2. Checking per-printer serialization...")
+    serialized = all(n == 1 for n in manager.max_active_per_printer.values())
+    print(f"   Max concurrent jobs per printer: {manager.max_active_per_printer}")
+    print(f"   Max concurrent jobs overall: {manager.max_active_total}")
+    ok &= serialized and manager.max_active_total == 2
+
+    print("\n3. Checking submission order per printer...")
+    in_order = [p for p in manager.order if p[0] == "Printer A"] == [
+        ("Printer A", f"label_{i}.png") for i in range(3)
+    ]
+    print(f"   Printer A jobs ran in order: {in_order}")
+    ok &= in_order
+
+    print("\n4. Checking backpressure...")
+    small = PrintScheduler(SlowPrinterManager(seconds_per_job=0.5), max_queue_per_printer=2)
+    rejected = False
+    try:
+        for i in range(5):
+            small.submit(PrintJob(str(i), "label.png", "Printer C"))
+    except SchedulerFullError as e:
+        rejected = True
+        print(f"   Rejected after {i} jobs: {e}")
+    ok &= rejected
+
+    print("\n5. Recording why a job failed...")
+    failing = PrintScheduler(SlowPrinterManager(seconds_per_job=0.01))
+    missing = failing.submit(PrintJob("1", "missing.png", "Printer D", quantity=2))
+    jammed = failing.submit(PrintJob("2", "jam.png", "Printer D", quantity=3))
+    wait_for([missing, jammed])
+    for job in (missing, jammed):
+        print(f"   {job.label_file}: {job.status}, printed {job.printed}/{job.quantity}, error: {job.error}")
+    ok &= missing.status == PrintJob.FAILED and missing.error == "Image file not found: missing.png"
+    ok &= jammed.printed == 1 and jammed.failed == 2 and "paper jam" in jammed.error
+
+    print(f"\n{'🎉 Print scheduler test PASSED!' if ok else '❌ Print scheduler test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_print_scheduler() else 1)
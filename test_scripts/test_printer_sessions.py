@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for printer session pooling using mock sessions
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from printing.bitmap_cache import PreparedLabel
+from printing.printer_session import MockPrinterSession, PrinterSessionPool
+
+
+def test_printer_sessions():
+    """Test that sessions are reused, rebuilt after errors and invalidated on demand"""
+    print("🧪 Testing Printer Session Pool")
+    print("=" * 50)
+    ok = True
+
+    output_dir = tempfile.mkdtemp(prefix="mock_sessions_")
+    created = []
+
+    def factory(printer_name):
+        session = MockPrinterSession(printer_name, output_dir)
+        created.append(session)
+        return session
+
+    pool = PrinterSessionPool(factory)
+    label = PreparedLabel("label.png", "portrait", Image.new('RGB', (100, 50), color='white'), (0, 0, 100, 50))
+
+    print("\n1. Printing 3 jobs to the same printer...")
+    for i in range(3):
+        with pool.session("DYMO LabelWriter 450") as session:
+            session.print_prepared(label, 2, f"job{i}")
+    print(f"   Sessions created: {len(created)}, pages printed: {created[0].pages}")
+    ok &= len(created) == 1 and created[0].pages == 6
+
+    print("\n2. Printing to a second printer...")
+    with pool.session("DYMO LabelWriter 4XL") as session:
+        session.print_prepared(label, 1, "other")
+    print(f"   Open printers: {sorted(pool.open_printers())}")
+    ok &= len(created) == 2
+
+    print("\n3. Failing a job and printing again...")
+    try:
+        with pool.session("DYMO LabelWriter 450"):
+            raise IOError("simulated spooler error")
+    except IOError:
+        pass
+    with pool.session("DYMO LabelWriter 450") as session:
+        session.print_prepared(label, 1, "after_error")
+    print(f"   Broken session closed: {created[0].closed}, sessions created: {len(created)}")
+    ok &= created[0].closed and len(created) == 3
+
+    print("\n4. Invalidating all sessions...")
+    pool.invalidate()
+    print(f"   Open printers: {pool.open_printers()}")
+    ok &= pool.open_printers() == [] and all(s.closed for s in created)
+
+    print("\n5. Reading device metrics while a job holds the session...")
+    area = pool.printable_area("DYMO LabelWriter 450")
+    spooling, release = threading.Event(), threading.Event()
+
+    def long_job():
+        with pool.session("DYMO LabelWriter 450"):
+            spooling.set()
+            release.wait(5)
+
+    job = threading.Thread(target=long_job)
+    job.start()
+    spooling.wait(5)
+    started = time.perf_counter()
+    busy_area = pool.printable_area("DYMO LabelWriter 450")
+    waited = time.perf_counter() - started
+    release.set()
+    job.join()
+    print(f"   Waited {waited * 1000:.1f} ms")
+    ok &= busy_area == area and waited < 0.5
+
+    print(f"\n{'🎉 Printer session test PASSED!' if ok else '❌ Printer session test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_printer_sessions() else 1)
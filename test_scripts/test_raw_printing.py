@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for raw printer command output (ZPL, EPL, DYMO)
+"""
+
+import os
+import re
+import sys
+import zlib
+import base64
+import binascii
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+from printing.backends.raw import RawBackend
+from printing.backends.virtual_spooler import VirtualSpoolerBackend
+from printing.printer_manager import PrinterManager
+
+
+def make_label(path):
+    """White 203x100 label with a black bar in the top left corner"""
+    image = Image.new('RGB', (203, 100), color='white')
+    ImageDraw.Draw(image).rectangle((0, 0, 15, 9), fill='black')
+    image.save(path)
+
+
+def test_raw_printing():
+    """Encode a label in each language, check the command streams and the caching"""
+    print("🧪 Testing Raw Printer Command Output")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="raw_printing_")
+    label_path = os.path.join(work_dir, "label.png")
+    make_label(label_path)
+
+    printers = {"Zebra ZPL": "zpl", "Zebra EPL": "epl", "DYMO LabelWriter": "dymo"}
+    spooler = VirtualSpoolerBackend(printers=list(printers), printable_area=None, time_scale=0)
+    backend = RawBackend(spooler, printers)
+    sent = []
+    backend.send = lambda printer_name, data, doc_name: sent.append((printer_name, data))
+    manager = PrinterManager(render_cache_dir=os.path.join(work_dir, "render_cache"), backend=backend)
+
+    print("\n1. ZPL with native quantity...")
+    printed = manager.print_image_batch(label_path, "Zebra ZPL", "portrait", 3)
+    data = sent[-1][1]
+    match = re.search(rb"\^GFA,(\d+),\d+,(\d+),:Z64:([^:]+):([0-9a-f]{4})\^FS\^PQ(\d+)\^XZ", data)
+    ok &= printed == 3 and match is not None
+    if match:
+        total, per_row, encoded, crc, quantity = match.groups()
+        ok &= int(crc, 16) == binascii.crc_hqx(encoded, 0)
+        bitmap = zlib.decompress(base64.b64decode(encoded))
+        # 203 dots wide -> 26 bytes per row; the bar is 16 dots wide: two 0xff bytes
+        ok &= int(total) == len(bitmap) == 26 * 100 and int(per_row) == 26 and int(quantity) == 3
+        ok &= bitmap[:3] == b"\xff\xff\x00" and bitmap[26 * 10:26 * 10 + 2] == b"\x00\x00"
+        print(f"   {len(data)} bytes for {len(bitmap)} bytes of bitmap, ^PQ{int(quantity)}")
+
+    print("\n2. EPL with native quantity...")
+    printed = manager.print_image_batch(label_path, "Zebra EPL", "portrait", 2)
+    data = sent[-1][1]
+    ok &= printed == 2 and data.startswith(b"\nN\nGW0,0,26,100,") and data.endswith(b"\nP2\n")
+    # EPL prints 0 bits, so the bar is 0x00 on a 0xff background
+    ok &= data[len(b"\nN\nGW0,0,26,100,"):][:3] == b"\x00\x00\xff"
+    print(f"   {len(data)} bytes")
+
+    print("\n3. DYMO repeats the program per copy and skips blank rows...")
+    printed = manager.print_image_batch(label_path, "DYMO LabelWriter", "portrait", 2)
+    data = sent[-1][1]
+    single = data[:len(data) // 2]
+    ok &= printed == 2 and data == single * 2 and single.endswith(b"\x1bE")
+    ok &= single.count(b"\x16") == 10
+    print(f"   {len(single)} bytes per copy")
+
+    print("\n4. Programs are encoded once per prepared label...")
+    prepared = manager.prepare_label(label_path, "Zebra ZPL", "portrait")
+    first = prepared.raw_program("zpl")
+    ok &= prepared.raw_program("zpl") is first
+
+    spooler.close()
+    print(f"\n{'🎉 Raw printing test PASSED!' if ok else '❌ Raw printing test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_raw_printing() else 1)
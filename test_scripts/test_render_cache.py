@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk SVG render cache
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from printing.render_cache import RenderCache
+
+
+def render(cache, key, color):
+    """Store a small PNG under ``key`` the way a finished render is stored"""
+    temp_path = cache.new_temp_path()
+    Image.new('RGB', (64, 32), color).save(temp_path, 'PNG')
+    return cache.put(key, temp_path)
+
+
+def test_render_cache():
+    """Check content-hash invalidation, LRU eviction under the byte cap and leftover cleanup"""
+    print("🧪 Testing Render Cache")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="render_cache_")
+    cache_dir = os.path.join(work_dir, "cache")
+    svg_path = os.path.join(work_dir, "label.svg")
+
+    print("\n1. Editing a label drops its cached renders...")
+    with open(svg_path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>')
+    cache = RenderCache(cache_dir)
+    digest = cache.source_digest(svg_path)
+    portrait = cache.make_key(digest, 203, "portrait")
+    landscape = cache.make_key(digest, 203, "landscape")
+    render(cache, portrait, 'white')
+    render(cache, landscape, 'white')
+    hit = cache.get(portrait) is not None
+    with open(svg_path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="20" height="10"/>')
+    new_digest = cache.source_digest(svg_path)
+    print(f"   Hit before edit: {hit}, digest changed: {new_digest != digest}, "
+          f"entries after edit: {cache.stats()['entries']}")
+    ok &= hit and new_digest != digest and cache.stats()['entries'] == 0
+    ok &= cache.get(portrait) is None and not os.path.exists(os.path.join(cache_dir, f"{portrait}.png"))
+    # An unchanged file is not hashed again
+    ok &= cache.source_digest(svg_path) == new_digest
+
+    print("\n2. Least recently used renders are evicted under the byte cap...")
+    entry_bytes = os.path.getsize(render(cache, "probe", 'black'))
+    cache.clear()
+    cache.max_bytes = int(entry_bytes * 2.5)
+    render(cache, "a", 'black')
+    render(cache, "b", 'black')
+    cache.get("a")  # "b" is now the least recently used
+    render(cache, "c", 'black')
+    kept = sorted(key for key in "abc" if cache.get(key))
+    stats = cache.stats()
+    print(f"   Kept: {kept}, {stats['bytes']} of {stats['max_bytes']} bytes")
+    ok &= kept == ["a", "c"] and stats['bytes'] <= stats['max_bytes']
+
+    print("\n3. Reopening the cache keeps the LRU order and skips interrupted writes...")
+    cache.flush()
+    leftover = os.path.join(cache_dir, ".tmp-1234-99999999.png")
+    Image.new('RGB', (64, 32), 'red').save(leftover, 'PNG')
+    reopened = RenderCache(cache_dir, max_bytes=cache.max_bytes)
+    stats = reopened.stats()
+    print(f"   Entries: {stats['entries']}, leftover removed: {not os.path.exists(leftover)}")
+    ok &= stats['entries'] == 2 and stats['bytes'] == 2 * entry_bytes and not os.path.exists(leftover)
+    loaded = reopened.load("c")
+    ok &= loaded is not None and loaded.size == (64, 32)
+
+    print("\n4. Background writes land in the cache...")
+    reopened.store_async("d", Image.new('RGB', (64, 32), 'gray'))
+    reopened.flush()
+    print(f"   Entries: {sorted(reopened._entries)}")
+    # "a" was used before "c" in step 2, so it is the one evicted
+    ok &= sorted(reopened._entries) == ["c", "d"]
+    ok &= not [name for name in os.listdir(cache_dir) if name.startswith(".tmp-")]
+
+    print(f"\n{'🎉 Render cache test PASSED!' if ok else '❌ Render cache test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_render_cache() else 1)
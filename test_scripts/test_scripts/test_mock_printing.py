@@ -70,13 +70,18 @@ def test_mock_printing():
     success = printer_manager.print_image(test_path, test_printer, "portrait")
     print(f"   Print result: {'✅ SUCCESS' if success else '❌ FAILED'}")
     
+    # Test batch printing
+    print("\n5. Testing batch printing (3 copies)...")
+    printed = printer_manager.print_image_batch(test_path, test_printer, "portrait", 3)
+    print(f"   Batch result: {'✅ SUCCESS' if printed == 3 else '❌ FAILED'} ({printed}/3 copies)")
+    
     # Test print functionality
-    print("\n5. Testing test_print method...")
+    print("\n6. Testing test_print method...")
     test_success = printer_manager.test_print(test_printer)
     print(f"   Test print result: {'✅ SUCCESS' if test_success else '❌ FAILED'}")
     
     # Clean up
-    print("\n6. Cleaning up...")
+    print("\n7. Cleaning up...")
     try:
         os.remove(test_path)
         print(f"   Removed test file: {test_path}")
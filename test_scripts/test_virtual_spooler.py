@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the virtual spooler printer backend
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from printing.backends.virtual_spooler import VirtualDocument, VirtualPrintFault, VirtualSpoolerBackend
+from printing.print_jobs import PrintError
+from printing.printer_manager import PrinterManager
+
+
+def print_copies(manager, label_path, copies):
+    """Copies printed, or the PrintError that stopped the print"""
+    try:
+        return manager.print_image_batch(label_path, "Virtual DYMO", "portrait", copies)
+    except PrintError as e:
+        return e
+
+
+def test_virtual_spooler():
+    """Test spool timing, queue limits and injected faults through PrinterManager"""
+    print("🧪 Testing Virtual Spooler Backend")
+    print("=" * 50)
+    ok = True
+
+    work_dir = tempfile.mkdtemp(prefix="virtual_spooler_")
+    label_path = os.path.join(work_dir, "label.png")
+    Image.new('RGB', (400, 200), color='white').save(label_path)
+
+    backend = VirtualSpoolerBackend(
+        printers=["Virtual DYMO"], page_seconds=0.05, accept_seconds=0.01,
+        spool_limit=2, spool_timeout=0.2
+    )
+    manager = PrinterManager(render_cache_dir=os.path.join(work_dir, "render_cache"), backend=backend)
+
+    print("\n1. Spooling a 4-copy job...")
+    started = time.monotonic()
+    printed = manager.print_image_batch(label_path, "Virtual DYMO", "portrait", 4)
+    spool_time = time.monotonic() - started
+    backend.wait_idle(5)
+    document = backend.documents[-1]
+    print(f"   Spooled {printed} copies in {spool_time * 1000:.0f} ms, "
+          f"printed in {(document.finished_at - document.started_at) * 1000:.0f} ms")
+    ok &= printed == 4 and document.status == VirtualDocument.DONE and document.pages_printed == 4
+    ok &= document.finished_at - document.started_at >= 0.2
+
+    print("\n2. Overfilling the spool queue...")
+    backend.page_seconds = 0.5
+    results = [print_copies(manager, label_path, 1) for _ in range(4)]
+    print(f"   Results: {results}")
+    # One document printing plus one waiting fills a spool of 2; the rest time out
+    ok &= results[:2] == [1, 1] and all("is full" in str(result) for result in results[2:])
+    backend.page_seconds = 0.01
+    backend.wait_idle(5)
+
+    print("\n3. Injecting a spool error...")
+    backend.inject_fault("Virtual DYMO", VirtualSpoolerBackend.SPOOL_ERROR)
+    first = print_copies(manager, label_path, 1)
+    second = print_copies(manager, label_path, 1)
+    print(f"   First print: {first}, retry: {second}")
+    ok &= isinstance(first, PrintError) and "Injected spool error" in str(first) and second == 1
+
+    print("\n4. Injecting a paper jam...")
+    backend.wait_idle(5)
+    backend.inject_fault("Virtual DYMO", VirtualSpoolerBackend.JAM)
+    manager.print_image_batch(label_path, "Virtual DYMO", "portrait", 3)
+    backend.wait_idle(5)
+    status = backend.printer_status("Virtual DYMO")
+    print(f"   Last document: {backend.documents[-1].status}, status: {status}")
+    ok &= backend.documents[-1].status == VirtualDocument.FAILED and status["failed_documents"] == 1
+
+    print("\n5. Taking the printer offline...")
+    backend.set_online("Virtual DYMO", False)
+    manager.refresh_printers()
+    printed = print_copies(manager, label_path, 1)
+    print(f"   Printers: {manager.get_available_printers()}, print result: {printed}")
+    ok &= "not available" in str(printed) and manager.get_available_printers() == []
+    try:
+        backend.open_session("Virtual DYMO")
+        ok = False
+    except VirtualPrintFault:
+        pass
+
+    backend.close()
+    print(f"\n{'🎉 Virtual spooler test PASSED!' if ok else '❌ Virtual spooler test FAILED'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_virtual_spooler() else 1)
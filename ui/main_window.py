@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import threading
 from typing import Optional
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                            QWidget, QLabel, QComboBox, QPushButton, QTableWidget, 
@@ -9,15 +10,29 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayo
 from PySide6.QtCore import Qt, QTimer, Signal, QThread
 from PySide6.QtGui import QFont
 
+from config.button_mapping import format_dpi, parse_dpi
 from config.config_manager import ConfigManager
 from printing.printer_manager import PrinterManager
 from server.flask_app import FlaskPrintServer
 
 class MainWindow(QMainWindow):
+    # Emitted from any thread when the printer registry sees a new printer list
+    printers_changed = Signal(list)
+    # Emitted from the config watcher thread when config.json was edited externally
+    config_reloaded = Signal(object)
+    
     def __init__(self):
         super().__init__()
         self.config_manager = ConfigManager()
-        self.printer_manager = PrinterManager()
+        config = self.config_manager.snapshot()
+        self.printer_manager = PrinterManager(
+            backends=list(config.get("printer_backends") or []) or None,
+            printer_routes=dict(config.get("printer_routes") or {}),
+            printer_languages=dict(config.get("printer_languages") or {}),
+            printer_monochrome=dict(config.get("printer_monochrome") or {}),
+            svg_renderer=config.get("svg_renderer") or "auto",
+            svg_debug_dir=config.get("svg_debug_dir") or None
+        )
         self.flask_server = FlaskPrintServer(self.config_manager, self.printer_manager)
         
         self.setup_logging()
@@ -25,6 +40,15 @@ class MainWindow(QMainWindow):
         self.load_configuration()
         self.setup_timer()
         
+        # Keep the printer dropdown in sync with the shared printer cache
+        self.printers_changed.connect(self.on_printers_changed)
+        self.printer_manager.printer_registry.subscribe(self.printers_changed.emit)
+        
+        # Pick up external edits to config.json
+        self.config_reloaded.connect(self.on_config_reloaded)
+        self.config_manager.add_reload_listener(self.config_reloaded.emit)
+        self.config_manager.start_watching()
+        
     def setup_logging(self):
         """Setup logging configuration"""
         logging.basicConfig(
@@ -117,6 +141,11 @@ class MainWindow(QMainWindow):
         self.start_server_btn.clicked.connect(self.toggle_server)
         server_controls.addWidget(self.start_server_btn)
         
+        self.restart_server_btn = QPushButton("Restart")
+        self.restart_server_btn.setToolTip("Restart the server with the host/port above, keeping queued jobs")
+        self.restart_server_btn.clicked.connect(self.restart_server)
+        server_controls.addWidget(self.restart_server_btn)
+        
         self.server_status_label = QLabel("Stopped")
         self.server_status_label.setStyleSheet("color: red; font-weight: bold;")
         server_controls.addWidget(self.server_status_label)
@@ -134,8 +163,8 @@ class MainWindow(QMainWindow):
         
         # Table for button mappings
         self.mappings_table = QTableWidget()
-        self.mappings_table.setColumnCount(3)
-        self.mappings_table.setHorizontalHeaderLabels(["Button ID", "Label File", "Orientation"])
+        self.mappings_table.setColumnCount(4)
+        self.mappings_table.setHorizontalHeaderLabels(["Button ID", "Label File", "Orientation", "DPI"])
         self.mappings_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.mappings_table.setSelectionBehavior(QTableWidget.SelectRows)
         layout.addWidget(self.mappings_table)
@@ -187,8 +216,10 @@ class MainWindow(QMainWindow):
     
     def refresh_printers(self):
         """Refresh the list of available printers"""
+        # Repopulating the combo must not count as a user selection
+        self.printer_combo.blockSignals(True)
         self.printer_combo.clear()
-        printers = self.printer_manager.get_available_printers()
+        printers = self.printer_manager.refresh_printers()
         
         if not printers:
             self.printer_combo.addItem("No printers found")
@@ -196,13 +227,55 @@ class MainWindow(QMainWindow):
         else:
             self.printer_combo.addItems(printers)
             self.logger.info(f"Found {len(printers)} printers")
+        
+        selected = self.config_manager.get_selected_printer()
+        index = self.printer_combo.findText(selected)
+        if index >= 0:
+            self.printer_combo.setCurrentIndex(index)
+        self.printer_combo.blockSignals(False)
+        
+        if not selected:
+            # Nothing chosen yet: adopt the printer the dropdown shows
+            self.on_printer_changed(self.printer_combo.currentText())
+    
+    def on_printers_changed(self, printers):
+        """Repopulate the printer dropdown after the printer cache changed"""
+        current = self.printer_combo.currentText()
+        self.printer_combo.blockSignals(True)
+        self.printer_combo.clear()
+        if printers:
+            self.printer_combo.addItems(printers)
+        else:
+            self.printer_combo.addItem("No printers found")
+        index = self.printer_combo.findText(current)
+        if index >= 0:
+            self.printer_combo.setCurrentIndex(index)
+        self.printer_combo.blockSignals(False)
     
     def on_printer_changed(self, printer_name):
         """Handle printer selection change"""
         if printer_name and printer_name != "No printers found":
+            if printer_name == self.config_manager.get_selected_printer():
+                return
             self.config_manager.set_selected_printer(printer_name)
             self.config_manager.save_config()
             self.logger.info(f"Selected printer: {printer_name}")
+            self.warm_label_cache()
+    
+    def warm_label_cache(self, labels=None):
+        """Prepare label bitmaps for the selected printer in the background"""
+        printer_name = self.config_manager.get_selected_printer()
+        if not printer_name:
+            return
+        
+        if labels is None:
+            labels = [(m.file, m.orientation, m.dpi) for m in self.config_manager.get_mapping_entries().values()]
+        
+        threading.Thread(
+            target=self.printer_manager.warm_labels,
+            args=(labels, printer_name),
+            daemon=True
+        ).start()
     
     def test_print(self):
         """Test print to selected printer"""
@@ -221,22 +294,23 @@ class MainWindow(QMainWindow):
     def toggle_server(self):
         """Toggle Flask server on/off"""
         if self.flask_server.is_server_running():
-            self.flask_server.stop_server()
-            self.start_server_btn.setText("Start Server")
-            self.server_status_label.setText("Stopped")
-            self.server_status_label.setStyleSheet("color: red; font-weight: bold;")
-            self.logger.info("Server stopped")
-        else:
-            host = self.host_edit.text()
-            port = self.port_spin.value()
+            # Stopping drains queued print jobs, so keep it off the GUI thread
+            def stop_server_thread():
+                try:
+                    self.flask_server.stop_server()
+                except Exception as e:
+                    self.logger.error(f"Error stopping server: {e}")
             
-            # Save server settings
-            self.config_manager.set("server_host", host)
-            self.config_manager.set("server_port", port)
-            self.config_manager.save_config()
+            threading.Thread(target=stop_server_thread, daemon=True).start()
+            
+            self.start_server_btn.setText("Stopping...")
+            self.server_status_label.setText("Stopping server...")
+            self.server_status_label.setStyleSheet("color: orange; font-weight: bold;")
+            self.logger.info("Stopping server")
+        else:
+            host, port = self.save_server_settings()
             
             # Start server in a separate thread to avoid blocking GUI
-            import threading
             def start_server_thread():
                 try:
                     self.flask_server.start_server(host, port)
@@ -255,35 +329,86 @@ class MainWindow(QMainWindow):
             self.server_status_label.setStyleSheet("color: orange; font-weight: bold;")
             self.logger.info(f"Starting server on {host}:{port}")
     
+    def save_server_settings(self):
+        """Save the host/port fields to the configuration and return them"""
+        host = self.host_edit.text()
+        port = self.port_spin.value()
+        self.config_manager.set("server_host", host)
+        self.config_manager.set("server_port", port)
+        self.config_manager.save_config()
+        return host, port
+    
+    def restart_server(self):
+        """Restart the server on the current host/port without dropping queued jobs"""
+        if not self.flask_server.is_server_running():
+            self.toggle_server()
+            return
+        
+        host, port = self.save_server_settings()
+        
+        def restart_server_thread():
+            try:
+                self.flask_server.restart_server(host, port)
+            except Exception as e:
+                self.logger.error(f"Error restarting server: {e}")
+        
+        threading.Thread(target=restart_server_thread, daemon=True).start()
+        
+        self.server_status_label.setText("Restarting server...")
+        self.server_status_label.setStyleSheet("color: orange; font-weight: bold;")
+        self.logger.info(f"Restarting server on {host}:{port}")
+    
+    def closeEvent(self, event):
+        """Stop the server and finish queued print jobs before exiting"""
+        if self.flask_server.is_server_running():
+            self.flask_server.stop_server()
+        self.config_manager.flush()
+        super().closeEvent(event)
+    
     def load_mappings(self):
         """Load button mappings into table"""
-        mappings = self.config_manager.get_button_mappings()
+        mappings = self.config_manager.get_mapping_entries()
         self.mappings_table.setRowCount(len(mappings))
         
-        for row, (button_id, mapping_data) in enumerate(mappings.items()):
+        for row, (button_id, mapping) in enumerate(mappings.items()):
             self.mappings_table.setItem(row, 0, QTableWidgetItem(button_id))
-            
-            # Handle both old format (string) and new format (dict)
-            if isinstance(mapping_data, dict):
-                label_file = mapping_data.get("file", "")
-                orientation = mapping_data.get("orientation", "portrait")
-            else:
-                # Backward compatibility with old format
-                label_file = mapping_data
-                orientation = "portrait"
-            
-            self.mappings_table.setItem(row, 1, QTableWidgetItem(label_file))
-            self.mappings_table.setItem(row, 2, QTableWidgetItem(orientation.title()))
+            self.mappings_table.setItem(row, 1, QTableWidgetItem(mapping.file))
+            self.mappings_table.setItem(row, 2, QTableWidgetItem(mapping.orientation.title()))
+            self.mappings_table.setItem(row, 3, QTableWidgetItem(format_dpi(mapping.dpi)))
+    
+    def on_config_reloaded(self, changed):
+        """Refresh the mappings table and label cache after an external config edit.
+        
+        Only the mappings in ``changed`` are prepared again, unless a printer
+        setting changed and every prepared label was dropped.
+        """
+        rewarm_all = self.printer_manager.set_printer_routes(dict(self.config_manager.get("printer_routes") or {}))
+        try:
+            rewarm_all |= self.printer_manager.set_printer_monochrome(
+                dict(self.config_manager.get("printer_monochrome") or {})
+            )
+        except ValueError as e:
+            self.logger.error(f"Invalid monochrome setting: {e}")
+        self.load_mappings()
+        if rewarm_all:
+            self.warm_label_cache()
+        else:
+            mappings = self.config_manager.get_mapping_entries()
+            labels = [(mappings[b].file, mappings[b].orientation, mappings[b].dpi) for b in changed if b in mappings]
+            if labels:
+                self.warm_label_cache(labels)
+        self.logger.info("Configuration reloaded from disk")
     
     def add_mapping(self):
         """Add new button mapping"""
         dialog = MappingDialog(self)
         if dialog.exec():
-            button_id, label_file, orientation = dialog.get_mapping()
+            button_id, label_file, orientation, dpi = dialog.get_mapping()
             if button_id and label_file:
-                self.config_manager.add_button_mapping(button_id, label_file, orientation)
+                self.config_manager.add_button_mapping(button_id, label_file, orientation, dpi)
                 self.config_manager.save_config()
                 self.load_mappings()
+                self.warm_label_cache([(label_file, orientation, dpi)])
                 self.logger.info(f"Added mapping: {button_id} -> {label_file} ({orientation})")
     
     def edit_mapping(self):
@@ -296,17 +421,19 @@ class MainWindow(QMainWindow):
         button_id = self.mappings_table.item(current_row, 0).text()
         label_file = self.mappings_table.item(current_row, 1).text()
         orientation = self.mappings_table.item(current_row, 2).text().lower()
+        dpi = parse_dpi(self.mappings_table.item(current_row, 3).text())
         
-        dialog = MappingDialog(self, button_id, label_file, orientation)
+        dialog = MappingDialog(self, button_id, label_file, orientation, dpi)
         if dialog.exec():
-            new_button_id, new_label_file, new_orientation = dialog.get_mapping()
+            new_button_id, new_label_file, new_orientation, new_dpi = dialog.get_mapping()
             if new_button_id and new_label_file:
-                # Remove old mapping
-                self.config_manager.remove_button_mapping(button_id)
-                # Add new mapping
-                self.config_manager.add_button_mapping(new_button_id, new_label_file, new_orientation)
+                # Swap old for new in one step so the server never sees neither
+                self.config_manager.replace_button_mapping(
+                    button_id, new_button_id, new_label_file, new_orientation, new_dpi
+                )
                 self.config_manager.save_config()
                 self.load_mappings()
+                self.warm_label_cache([(new_label_file, new_orientation, new_dpi)])
                 self.logger.info(f"Updated mapping: {new_button_id} -> {new_label_file} ({new_orientation})")
     
     def remove_mapping(self):
@@ -338,12 +465,23 @@ class MainWindow(QMainWindow):
         
         # Update status bar
         printer_count = len(self.printer_manager.get_available_printers())
-        mapping_count = len(self.config_manager.get_button_mappings())
-        self.status_bar.showMessage(f"Printers: {printer_count} | Mappings: {mapping_count}")
+        mapping_count = len(self.config_manager.get_mapping_entries())
+        message = f"Printers: {printer_count} | Mappings: {mapping_count}"
+        
+        warmup = self.flask_server.warmup_report
+        if warmup['state'] == 'running':
+            message += f" | Warm-up: {len(warmup['labels'])}/{mapping_count} labels..."
+        elif warmup['state'] == 'done':
+            ready = len(warmup['labels']) - warmup['failed']
+            message += f" | Warm-up: {ready}/{len(warmup['labels'])} labels in {warmup['seconds']:.1f}s"
+            if warmup['failed']:
+                failed = [b for b, r in warmup['labels'].items() if not r['ok']]
+                message += f" (failed: {', '.join(failed)})"
+        self.status_bar.showMessage(message)
 
 
 class MappingDialog(QDialog):
-    def __init__(self, parent=None, button_id="", label_file="", orientation="portrait"):
+    def __init__(self, parent=None, button_id="", label_file="", orientation="portrait", dpi=None):
         super().__init__(parent)
         self.setWindowTitle("Button Mapping")
         self.setModal(True)
@@ -379,6 +517,14 @@ class MappingDialog(QDialog):
         orientation_layout.addStretch()
         layout.addLayout(orientation_layout)
         
+        # Render DPI (SVG labels): empty fits the label to the printer
+        dpi_layout = QHBoxLayout()
+        dpi_layout.addWidget(QLabel("Render DPI:"))
+        self.dpi_edit = QLineEdit("" if dpi is None else format_dpi(dpi))
+        self.dpi_edit.setPlaceholderText("Auto (fit to printer), a number, or 'device'")
+        dpi_layout.addWidget(self.dpi_edit)
+        layout.addLayout(dpi_layout)
+        
         # Buttons
         button_layout = QHBoxLayout()
         ok_btn = QPushButton("OK")
@@ -405,6 +551,7 @@ class MappingDialog(QDialog):
         return (
             self.button_id_edit.text(), 
             self.label_file_edit.text(),
-            self.orientation_combo.currentText().lower()
+            self.orientation_combo.currentText().lower(),
+            parse_dpi(self.dpi_edit.text())
         )
 